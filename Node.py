@@ -1,20 +1,39 @@
 import heapq
 import time
+from array import array
+
+from checkpoint import load_a_star, load_ida_star, save_a_star, save_ida_star
+from open_list import OPEN_LISTS
+from pattern_db import PatternDatabase, default_path
+from perfect_db import PerfectDatabase, default_perfect_path
+from search_stats import SearchStats
+from solution import LETTERS, Solution
+
+# Code of the move that undoes each move (names and letters are in solution.py)
+INVERSE = (1, 0, 3, 2)
+
+# Largest size with a precomputed line-conflict table ((n+1)^n entries)
+CONFLICT_TABLE_MAX_N = 6
+
+# Approximate bytes per stored search node, used to turn max_bytes into a node budget
+NODE_BYTES = 200
+
 
 class Node:
 
-    _counter = 0  # unique id for tie-breaking in heap
+    __slots__ = ("state", "zero", "parent", "move", "g", "h", "id")
 
-    def __init__(self, state, g, parent=None, action=None):
-        
-        # Convert list state to tuple for hashing (dictionary keys)
-        if isinstance(state, list):
-            state = tuple(tuple(row) for row in state)
+    _counter = 0     # unique id for tie-breaking in heap
+    _neighbors = {}  # cached blank-move tables per puzzle size
+
+    def __init__(self, state, g, parent=None, move=None, zero=None):
         
-        self.state = state          # board configuration
+        self.state = state          # packed board configuration (int)
+        self.zero = zero            # blank cell index (row-major)
         self.parent = parent        # parent node in search tree
-        self.action = action        # move taken to reach this node
+        self.move = move            # move code taken to reach this node
         self.g = g                  # path cost
+        self.h = None               # heuristic value, filled in by the search
         self.id = Node._counter     # tie-breaker id
         Node._counter += 1
 
@@ -22,23 +41,45 @@ class Node:
     def __lt__(self, other):
         return self.id < other.id
 
-    # Generate all valid neighboring states
-    def expand(self):
-        x, y = Node.find_zero(self.state)
+    # Generate the neighboring states, except the one undoing the move that led here
+    # (it is the parent, always reached before with a lower g)
+    def expand(self, n, bits):
         children = []
+        state, zero = self.state, self.zero
+        mask = (1 << bits) - 1
+        back = None if self.move is None else INVERSE[self.move]
 
-        moves = [("Up", x-1, y), ("Down", x+1, y),
-                 ("Left", x, y-1), ("Right", x, y+1)]
-
-        for name, nx, ny in moves:
-            if 0 <= nx < len(self.state) and 0 <= ny < len(self.state):
-                new_state = Node.copy_state(self.state)
-                # Swap zero with target tile
-                new_state[x][y], new_state[nx][ny] = new_state[nx][ny], new_state[x][y]
-                children.append(Node(new_state, self.g + 1, self, (name, (nx, ny))))
+        for move, target in Node.neighbors(n)[zero]:
+            if move == back:
+                continue
+            # Slide target tile into the blank cell
+            tile = (state >> (target * bits)) & mask
+            new_state = state ^ (tile << (target * bits)) ^ (tile << (zero * bits))
+            children.append(type(self)(new_state, self.g + 1, self, move, target))
 
         return children
 
+    # Child reached by sliding the tile at target into the blank
+    def apply(self, move, target, bits):
+        tile = (self.state >> (target * bits)) & ((1 << bits) - 1)
+        new_state = self.state ^ (tile << (target * bits)) ^ (tile << (self.zero * bits))
+        return type(self)(new_state, self.g + 1, self, move, target)
+
+    # Per blank cell: list of (move code, target cell) for legal moves
+    @staticmethod
+    def neighbors(n):
+        table = Node._neighbors.get(n)
+        if table is None:
+            table = []
+            for x in range(n):
+                for y in range(n):
+                    moves = [(0, x-1, y), (1, x+1, y), (2, x, y-1), (3, x, y+1)]
+                    table.append(tuple((move, nx * n + ny) for move, nx, ny in moves
+                                       if 0 <= nx < n and 0 <= ny < n))
+            table = tuple(table)
+            Node._neighbors[n] = table
+        return table
+
     # Locate zero tile position
     @staticmethod
     def find_zero(state):
@@ -53,123 +94,448 @@ class Node:
         return [list(row) for row in state]
 
 
+class BoundedNode(Node):
+
+    __slots__ = ("f", "key", "children", "forgotten", "open", "alive")
+
+    # Node of a memory-bounded search: keeps its live children and the lowest f
+    # among children dropped to free memory
+    def __init__(self, state, g, parent=None, move=None, zero=None):
+        super().__init__(state, g, parent, move, zero)
+        self.f = 0                      # backed-up lower bound on solutions through the node
+        self.key = 0                    # open-list priority
+        self.children = []
+        self.forgotten = float("inf")
+        self.open = False
+        self.alive = True
+
+
+class NodeStore:
+
+    # Search nodes as parallel arrays indexed by an integer handle
+    def __init__(self):
+        self.states = []            # packed states
+        self.g = array("H")         # path costs
+        self.h = array("H")         # heuristic values
+        self.parent = array("i")    # parent handle, -1 for the root
+        self.move = array("b")      # move code, -1 for the root
+        self.zero = array("B")      # blank cell index
+
+    def __len__(self):
+        return len(self.states)
+
+    # Append a node and return its handle (handles grow in insertion order)
+    def add(self, state, zero, g, h, parent=-1, move=-1):
+        self.states.append(state)
+        self.g.append(g)
+        self.h.append(h)
+        self.parent.append(parent)
+        self.move.append(move)
+        self.zero.append(zero)
+        return len(self.states) - 1
+
+    # Detached Node view of a handle (no parent link)
+    def node(self, handle):
+        move = self.move[handle]
+        node = Node(self.states[handle], self.g[handle], None,
+                    None if move < 0 else move, self.zero[handle])
+        node.h = self.h[handle]
+        return node
+
+    # Linked Node chain from the root to a handle, following parent indices
+    def chain(self, handle):
+        handles = []
+        while handle >= 0:
+            handles.append(handle)
+            handle = self.parent[handle]
+
+        node = None
+        for handle in reversed(handles):
+            child = self.node(handle)
+            child.parent = node
+            node = child
+        return node
+
+
+class SearchFrontier:
+
+    # One direction of a bidirectional search; tree supplies the heuristic
+    # toward the opposite endpoint
+    def __init__(self, tree, root):
+        self.tree = tree
+        self.nodes = {}          # state -> Node with the best g found (open or closed)
+        self.open = set()        # states still to expand
+        self.by_priority = []    # (max(f, 2g), node)
+        self.by_f = []           # (f, node)
+        self.by_g = []           # (g, node)
+
+        root.h = tree.heuristic(root.state)
+        self.add(root)
+
+    def add(self, node):
+        self.nodes[node.state] = node
+        self.open.add(node.state)
+        f = node.g + node.h
+        heapq.heappush(self.by_priority, (max(f, 2 * node.g), node))
+        heapq.heappush(self.by_f, (f, node))
+        heapq.heappush(self.by_g, (node.g, node))
+
+    # Smallest key among open nodes of a heap, dropping outdated entries
+    def min_key(self, heap):
+        while heap:
+            key, node = heap[0]
+            if node.state in self.open and self.nodes[node.state] is node:
+                return key
+            heapq.heappop(heap)
+        return float("inf")
+
+    # Remove and return the open node with the lowest priority
+    def pop(self):
+        self.min_key(self.by_priority)
+        _, node = heapq.heappop(self.by_priority)
+        self.open.discard(node.state)
+        return node
+
+
 class SearchTree:
 
-    def __init__(self, initial_state, goal_state, heuristic_name="manhattan_linear_conflict"):
+    _conflict_tables = {}   # cached line-conflict tables per puzzle size
+
+    def __init__(self, initial_state, goal_state, heuristic_name="manhattan_linear_conflict",
+                 pattern_db=None, max_nodes=None, max_bytes=None, cache=None, perfect_db=None):
 
-        # Convert goal to tuple if needed
-        if isinstance(goal_state, list):
-            goal_state = tuple(tuple(row) for row in goal_state)
-        
-        self.goal_state = goal_state
-        self.root = Node(initial_state, 0)
         self.n = len(goal_state)
+        self.bits = (self.n * self.n - 1).bit_length()  # bits per packed tile
+        self.mask = (1 << self.bits) - 1
         self.heuristic_name = heuristic_name
 
+        # Pack boards into ints; tuples only reappear in solution()
+        self.goal_state = self.encode(goal_state)
+        self.root = Node(self.encode(initial_state), 0, zero=self.blank_index(initial_state))
+
         # Precompute goal positions for fast lookup
         self.goal_pos = {}
         for i in range(self.n):
             for j in range(self.n):
-                tile = self.goal_state[i][j]
+                tile = goal_state[i][j]
                 self.goal_pos[tile] = (i, j)
 
+        # Manhattan distance of every tile from every cell (0 for the blank)
+        n = self.n
+        self.distance = [[0] * (n * n) for _ in range(n * n)]
+        for tile, (gx, gy) in self.goal_pos.items():
+            if tile != 0:
+                self.distance[tile] = [abs(k // n - gx) + abs(k % n - gy) for k in range(n * n)]
+
+        # Cells of each row (axis 0) and column (axis 1), and per line the digit of every
+        # tile in a line key: 1 + its goal coordinate along the line if the line is its
+        # goal line, else 0. A line's conflicts are conflict_table(n)[key]; larger
+        # boards count inversions among the digits instead.
+        self.line_cells = (tuple(tuple(range(line * n, (line + 1) * n)) for line in range(n)),
+                           tuple(tuple(range(line, n * n, n)) for line in range(n)))
+        self.line_digits = tuple(tuple([0] * (n * n) for _ in range(n)) for _ in range(2))
+        for tile, goal in self.goal_pos.items():
+            if tile != 0:
+                self.line_digits[0][goal[0]][tile] = goal[1] + 1
+                self.line_digits[1][goal[1]][tile] = goal[0] + 1
+        self.conflicts = SearchTree.conflict_table(n) if n <= CONFLICT_TABLE_MAX_N else None
+        self.goal_tiles = self.tiles(self.goal_state)
+
+        # Pattern database tables (loaded from the default file if not given)
+        if heuristic_name == "pattern_database" and pattern_db is None:
+            pattern_db = PatternDatabase.load(default_path(self.n))
+        if pattern_db is not None and pattern_db.goal != tuple(self.tiles(self.goal_state)):
+            raise ValueError("Pattern database was built for a different goal state")
+        self.pattern_db = pattern_db
+
+        # Exact 3x3 distance table (loaded from the default file if not given). A table
+        # built for another goal with the blank in the same cell works after relabelling
+        # every tile as the table's goal tile on its goal cell.
+        if heuristic_name == "perfect" and perfect_db is None:
+            perfect_db = PerfectDatabase.load(default_perfect_path())
+        if perfect_db is not None:
+            if perfect_db.n != self.n or perfect_db.goal[self.goal_tiles.index(0)] != 0:
+                raise ValueError("Perfect table was built for a different goal state")
+            self.perfect_labels = [perfect_db.goal[cell] for cell in self.cells(self.goal_tiles)]
+        self.perfect_db = perfect_db
+        self.stats = None           # SearchStats of the last A_star, SMA_star, ARA_star,
+                                    # EPEA_star or bidirectional run
+
+        # Memory budget in stored nodes (max_bytes is converted with NODE_BYTES)
+        if max_bytes is not None:
+            by_bytes = max(1, max_bytes // NODE_BYTES)
+            max_nodes = by_bytes if max_nodes is None else min(max_nodes, by_bytes)
+        self.max_nodes = max_nodes
+
+        # Optional SolutionCache of exact distances shared between searches
+        self.cache = cache
+
+    # Pack a board (rows of tiles) into a single int
+    def encode(self, board):
+        return self.pack(tile for row in board for tile in row)
+
+    # Pack a flat row-major tile sequence into a single int
+    def pack(self, tiles):
+        state = 0
+        for k, tile in enumerate(tiles):
+            state |= tile << (k * self.bits)
+        return state
+
+    # Unpack an int state into a tuple of tuples
+    def decode(self, state):
+        n, bits, mask = self.n, self.bits, self.mask
+        return tuple(tuple((state >> ((i * n + j) * bits)) & mask for j in range(n))
+                     for i in range(n))
+
+    # Blank cell index of a board (rows of tiles)
+    def blank_index(self, board):
+        x, y = Node.find_zero(board)
+        return x * self.n + y
+
+    # Tiles of a packed state in row-major order
+    def tiles(self, state):
+        bits, mask = self.bits, self.mask
+        return [(state >> (k * bits)) & mask for k in range(self.n * self.n)]
+
+    # Cell index of every tile (inverse of tiles)
+    @staticmethod
+    def cells(tiles):
+        where = [0] * len(tiles)
+        for cell, tile in enumerate(tiles):
+            where[tile] = cell
+        return where
+
+    # Whether the goal is reachable from the root: the permutation of all cells (blank
+    # included) relative to the goal must have the parity of the blank's Manhattan move
+    def solvable(self):
+        n = self.n
+        goal_cell = self.cells(self.goal_tiles)
+        target = [goal_cell[tile] for tile in self.tiles(self.root.state)]
+        swaps = 0
+        for cell in range(len(target)):
+            while target[cell] != cell:
+                other = target[cell]
+                target[cell], target[other] = target[other], other
+                swaps += 1
+        zero, home = self.root.zero, goal_cell[0]
+        blank_moves = abs(zero // n - home // n) + abs(zero % n - home % n)
+        return swaps % 2 == blank_moves % 2
+
+    # Additive pattern database heuristic
+    def pattern_dist(self, state):
+        return self.pattern_db.value(self.cells(self.tiles(state)))
+
+    # Exact distance from the perfect table (3x3 only)
+    def perfect_dist(self, state):
+        labels = self.perfect_labels
+        return self.perfect_db.distance([labels[tile] for tile in self.tiles(state)])
+
+    # Goal node reached from node by descending the perfect table, or None if the goal
+    # cannot be reached
+    def _perfect_path(self, node):
+        labels = self.perfect_labels
+        moves = self.perfect_db.path([labels[tile] for tile in self.tiles(node.state)])
+        if moves is None:
+            return None
+        for move in moves:
+            node = node.apply(move, node.zero + (-self.n, self.n, -1, 1)[move], self.bits)
+        return node
+
     # Check if state equals goal
     def goal_test(self, state):
         return state == self.goal_state
 
     # Manhattan distance heuristic
     def manhattan_dist(self, state):
-        res = 0
-        for i in range(self.n):
-            for j in range(self.n):
-                tile = state[i][j]
-                if tile != 0:
-                    gx, gy = self.goal_pos[tile]
-                    res += abs(i - gx) + abs(j - gy)
-        return res
+        distance = self.distance
+        return sum(distance[tile][k] for k, tile in enumerate(self.tiles(state)))
     
     # Count misplaced tiles
     def misplaced_tiles(self, state):
         res = 0
-        for i in range(self.n):
-            for j in range(self.n):
-                tile = state[i][j]
-                if tile != 0:
-                    gx, gy = self.goal_pos[tile]
-                    if (i, j) != (gx, gy):
-                        res += 1
+        n = self.n
+        for k, tile in enumerate(self.tiles(state)):
+            if tile != 0:
+                if (k // n, k % n) != self.goal_pos[tile]:
+                    res += 1
         return res
     
-    # Gaschnig's heuristic
+    # Gaschnig's heuristic: while the blank is off its goal cell, move the tile that
+    # belongs there into it. Once the blank is home, the remaining misplaced tiles are
+    # swapped into place at no cost, so the value is the number of moves that bring
+    # the blank home. where is the inverse permutation (tile -> cell), kept in step.
     def Gashing_dist(self, state):
-        temp = Node.copy_state(state)
-        res = 0
+        tiles = self.tiles(state)
+        where = self.cells(tiles)
+        goal = self.goal_tiles
+        gx, gy = self.goal_pos[0]
+        home = gx * self.n + gy
 
-        while self.misplaced_tiles(temp) > 0:
-            zero_x, zero_y = Node.find_zero(temp)
-            
-            # If zero not in goal position, swap with correct tile
-            if (zero_x, zero_y) != self.goal_pos[0]:
-                tile = self.goal_state[zero_x][zero_y]
-                for i in range(self.n):
-                    for j in range(self.n):
-                        if temp[i][j] == tile:
-                            gx, gy = i, j
-                temp[gx][gy], temp[zero_x][zero_y] = temp[zero_x][zero_y], temp[gx][gy]
-            else:
-                # Otherwise swap any misplaced tile
-                for i in range(self.n):
-                    for j in range(self.n):
-                        if temp[i][j] != 0:
-                            gx, gy = self.goal_pos[temp[i][j]]
-                            if (i, j) != (gx, gy):
-                                temp[gx][gy], temp[i][j] = temp[i][j], temp[gx][gy]
-                                break
-                else:
-                    continue
+        res = 0
+        zero = where[0]
+        while zero != home:
+            tile = goal[zero]
+            zero, where[tile] = where[tile], zero
             res += 1
         return res
 
-    # Count inversions (used for linear conflict)
+    # Count inversions of comparable values (linear conflict, solvability) in O(k log k)
+    # with a Fenwick tree over their ranks: scanning right to left, each value adds the
+    # number of smaller values already seen
     @staticmethod
     def _count_inversions(values):
+        if not values:
+            return 0
+        ranks = {value: rank for rank, value in enumerate(sorted(set(values)))}
+        size = len(ranks)
+        tree = [0] * (size + 1)
         inversions = 0
-        for i in range(len(values)):
-            for j in range(i + 1, len(values)):
-                if values[i] > values[j]:
-                    inversions += 1
+        for value in reversed(values):
+            value = ranks[value]
+            i = value               # prefix sum over values below this one
+            while i > 0:
+                inversions += tree[i]
+                i -= i & -i
+            i = value + 1
+            while i <= size:
+                tree[i] += 1
+                i += i & -i
         return inversions
 
+    # Conflicts of every line key of an n x n puzzle: inversions among its nonzero
+    # digits, read as base n+1 numbers with the first cell most significant
+    @staticmethod
+    def conflict_table(n):
+        table = SearchTree._conflict_tables.get(n)
+        if table is None:
+            # Extend every key of k digits by one more digit, counting the larger
+            # nonzero digits already in the key
+            table = bytearray(1)
+            larger = [[0] * (n + 1)]    # per key: count of digits above each value
+            for _ in range(n):
+                next_table = bytearray(len(table) * (n + 1))
+                next_larger = []
+                for key, above in enumerate(larger):
+                    base = key * (n + 1)
+                    next_table[base] = table[key]
+                    next_larger.append(above)
+                    for digit in range(1, n + 1):
+                        next_table[base + digit] = table[key] + above[digit]
+                        next_larger.append([count + (value < digit)
+                                            for value, count in enumerate(above)])
+                table, larger = next_table, next_larger
+            SearchTree._conflict_tables[n] = table
+        return table
+
     # Linear conflict heuristic component
     def linear_conflict(self, state):
-        conflicts = 0
-
-        # Row conflicts
-        for row in range(self.n):
-            goal_cols = []
-            for col in range(self.n):
-                tile = state[row][col]
-                if tile == 0:
-                    continue
-                goal_row, goal_col = self.goal_pos[tile]
-                if goal_row == row:
-                    goal_cols.append(goal_col)
-            conflicts += self._count_inversions(goal_cols)
-
-        # Column conflicts
-        for col in range(self.n):
-            goal_rows = []
-            for row in range(self.n):
-                tile = state[row][col]
-                if tile == 0:
-                    continue
-                goal_row, goal_col = self.goal_pos[tile]
-                if goal_col == col:
-                    goal_rows.append(goal_row)
-            conflicts += self._count_inversions(goal_rows)
-
+        tiles = self.tiles(state)
+        lines = range(self.n)
+        conflicts = self._board_conflicts(tiles, 0, lines) + self._board_conflicts(tiles, 1, lines)
         return 2 * conflicts  # each conflict adds 2 moves
 
+    # Total conflicts over the given rows (axis 0) or columns (axis 1) of a packed state
+    def _state_conflicts(self, state, axis, lines):
+        bits, mask, base, table = self.bits, self.mask, self.n + 1, self.conflicts
+        if table is None:
+            return self._board_conflicts(self.tiles(state), axis, lines)
+        total = 0
+        for line in lines:
+            digits = self.line_digits[axis][line]
+            key = 0
+            for cell in self.line_cells[axis][line]:
+                key = key * base + digits[(state >> (cell * bits)) & mask]
+            total += table[key]
+        return total
+
+    # Total conflicts over the given rows/columns of a flat tile list
+    def _board_conflicts(self, board, axis, lines):
+        base, table = self.n + 1, self.conflicts
+        total = 0
+        for line in lines:
+            digits = self.line_digits[axis][line]
+            if table is None:
+                total += self._count_inversions([digits[board[cell]]
+                                                 for cell in self.line_cells[axis][line]
+                                                 if digits[board[cell]]])
+                continue
+            key = 0
+            for cell in self.line_cells[axis][line]:
+                key = key * base + digits[board[cell]]
+            total += table[key]
+        return total
+
+    # Manhattan change when tile slides from cell src to cell dst
+    def _manhattan_delta(self, tile, src, dst):
+        distance = self.distance[tile]
+        return distance[dst] - distance[src]
+
+    # Lines whose conflicts can change when a tile slides from src to dst
+    def _moved_lines(self, src, dst):
+        n = self.n
+        # Horizontal moves only touch two columns, vertical ones two rows
+        if src // n == dst // n:
+            return 1, (src % n, dst % n)
+        return 0, (src // n, dst // n)
+
+    # Heuristic of a child derived from its parent's value by a one-tile delta
+    def update_heuristic(self, parent, child):
+        name = self.heuristic_name
+        src, dst = child.zero, parent.zero   # the moved tile went from src to dst
+        tile = (child.state >> (dst * self.bits)) & self.mask
+
+        if name == "manhattan" or name == "manhattan_linear_conflict":
+            h = parent.h + self._manhattan_delta(tile, src, dst)
+            if name == "manhattan_linear_conflict":
+                axis, lines = self._moved_lines(src, dst)
+                h += 2 * (self._state_conflicts(child.state, axis, lines)
+                          - self._state_conflicts(parent.state, axis, lines))
+            return h
+        if name == "misplaced_tiles":
+            gx, gy = self.goal_pos[tile]
+            goal = gx * self.n + gy
+            return parent.h + (dst != goal) - (src != goal)
+        if name == "pattern_database":
+            # Only the moved tile's pattern changes
+            pattern = self.pattern_db.pattern_of[tile]
+            if pattern is None:
+                return parent.h
+            return (parent.h
+                    + self.pattern_db.pattern_value(pattern, self.cells(self.tiles(child.state)))
+                    - self.pattern_db.pattern_value(pattern, self.cells(self.tiles(parent.state))))
+        return self.heuristic(child.state)
+
+    # Slide the tile at target into the blank of a flat board in place; returns the new h
+    def _apply_move(self, board, zero, target, h):
+        name = self.heuristic_name
+        n = self.n
+        tile = board[target]
+
+        if name == "manhattan" or name == "manhattan_linear_conflict":
+            h += self._manhattan_delta(tile, target, zero)
+            if name == "manhattan_linear_conflict":
+                axis, lines = self._moved_lines(target, zero)
+                h -= 2 * self._board_conflicts(board, axis, lines)
+                board[zero], board[target] = tile, 0
+                h += 2 * self._board_conflicts(board, axis, lines)
+                return h
+            board[zero], board[target] = tile, 0
+            return h
+
+        if name == "pattern_database":
+            pattern = self.pattern_db.pattern_of[tile]
+            if pattern is not None:
+                h -= self.pattern_db.pattern_value(pattern, self.cells(board))
+                board[zero], board[target] = tile, 0
+                return h + self.pattern_db.pattern_value(pattern, self.cells(board))
+
+        board[zero], board[target] = tile, 0
+        if name == "misplaced_tiles":
+            gx, gy = self.goal_pos[tile]
+            goal = gx * n + gy
+            return h + (zero != goal) - (target != goal)
+        return self.heuristic(self.pack(board))
+
     # Select heuristic function
     def heuristic(self, state):
         if self.heuristic_name == "manhattan_linear_conflict":
@@ -180,56 +546,769 @@ class SearchTree:
             return self.misplaced_tiles(state)
         if self.heuristic_name == "gasching":
             return self.Gashing_dist(state)
+        if self.heuristic_name == "pattern_database":
+            return self.pattern_dist(state)
+        if self.heuristic_name == "perfect":
+            return self.perfect_dist(state)
         raise ValueError(f"Unknown heuristic: {self.heuristic_name}")    
 
-    # A* search algorithm
-    def A_star(self, time_limit=None):
+    # A* search algorithm; open_list selects "heap" or "buckets" (see open_list.py).
+    # Counters and timings are kept in self.stats, also when the search fails.
+    # progress(stats) is called every progress_every expansions; returning False aborts.
+    # A search that stops early (timeout, memory limit, abort) is saved to the checkpoint
+    # path if given; resume continues from such a file instead of starting at the root.
+    def A_star(self, time_limit=None, open_list="heap", progress=None, progress_every=1000,
+               checkpoint=None, resume=None):
         start_time = time.time()
         processed_nodes = 1
+        clock = time.perf_counter
+
+        if open_list not in OPEN_LISTS:
+            raise ValueError(f"Unknown open list: {open_list}")
+        if progress_every < 1:
+            raise ValueError(f"progress_every must be at least 1, got {progress_every}")
+
+        stats = self.stats = SearchStats()
 
         if self.goal_test(self.root.state):
+            stats.finish("solved")
             return self.solution(self.root), self.root.g, processed_nodes, True
-        
-        frontier = []          # priority queue
-        best_g = {}            # best cost to each state
 
-        best_g[self.root.state] = self.root.g
-        heapq.heappush(frontier, (self.root.g + self.heuristic(self.root.state), self.root))
+        # A perfect table answers without searching
+        if self.perfect_db is not None:
+            goal = self._perfect_path(self.root)
+            if goal is None:
+                stats.finish("exhausted")
+                return None
+            stats.finish("solved")
+            return self.solution(goal), goal.g, goal.g + 1, True
+
+        cache = self.cache
+        if cache is not None:
+            goal = self._cached_path(self.root)
+            if goal is not None:
+                stats.finish("solved")
+                return self.solution(goal), goal.g, processed_nodes, True
+        known = {}                           # cached exact distances met during the search
+
+        frontier = OPEN_LISTS[open_list]()   # priority queue of handles
+        store = NodeStore()                  # node fields by handle
+        best_g = {}                          # handle with the best cost to each state
+
+        if resume is not None:
+            # Cached exact distances are not saved; they are found again when regenerated
+            processed_nodes = load_a_star(resume, self, store, best_g, frontier,
+                                          open_list, stats)
+        else:
+            root = self.root
+            root.h = self.heuristic(root.state)
+            handle = store.add(root.state, root.zero, root.g, root.h)
+            best_g[root.state] = handle
+            frontier.push(root.g + root.h, root.g, handle)
+
+        # Record why the search stopped, saving it for a later resume
+        def stop(status):
+            stats.finish(status)
+            if checkpoint is not None:
+                save_a_star(checkpoint, self, store, frontier, open_list, processed_nodes, stats)
+            return False
 
         while frontier:
 
             # Stop if time limit exceeded
             if time_limit is not None and (time.time() - start_time) >= time_limit:
                 print("\nTime limit exceeded")
-                return False
+                return stop("timeout")
+
+            if len(frontier) > stats.peak_open:
+                stats.peak_open = len(frontier)
 
-            _, node = heapq.heappop(frontier)
+            tick = clock()
+            handle = frontier.pop()
+            stats.queue_time += clock() - tick
 
             # Skip outdated entries
-            if node.g > best_g.get(node.state, float("inf")):
+            if best_g[store.states[handle]] != handle:
+                stats.stale += 1
                 continue
 
+            node = store.node(handle)
             if self.goal_test(node.state):
-                return self.solution(node), node.g, processed_nodes, True
-            
+                stats.finish("solved")
+                goal = store.chain(handle)
+                self._remember(goal)
+                return self.solution(goal), node.g, processed_nodes, True
+
+            # A cached state at the front of the open list completes an optimal path
+            if node.state in known:
+                goal = self._cached_path(store.chain(handle))
+                if goal is not None:
+                    stats.finish("solved")
+                    self._remember(goal)
+                    return self.solution(goal), goal.g, processed_nodes, True
+
             # Expand node
-            for child in node.expand():
+            tick = clock()
+            children = node.expand(self.n, self.bits)
+            stats.expand_time += clock() - tick
+            stats.expansions += 1
+            stats.generated += len(children)
+
+            for child in children:
                 child_g = child.g
-                if child_g < best_g.get(child.state, float("inf")):
-                    best_g[child.state] = child_g
-                    cost = child_g + self.heuristic(child.state)
+                best = best_g.get(child.state)
+                if best is None or child_g < store.g[best]:
+                    tick = clock()
+                    child.h = self.update_heuristic(node, child)
+                    stats.heuristic_time += clock() - tick
+                    cost = child_g + child.h
+                    if cache is not None:
+                        # Exact distance as heuristic; child.h stays the base value
+                        # that update_heuristic builds on
+                        exact = cache.distance(self.goal_state, child.state)
+                        if exact is not None:
+                            known[child.state] = exact
+                            cost = child_g + exact
+                    child_handle = store.add(child.state, child.zero, child_g, child.h,
+                                             handle, child.move)
+                    best_g[child.state] = child_handle
                     processed_nodes += 1
-                    heapq.heappush(frontier, (cost, child))
+                    tick = clock()
+                    frontier.push(cost, child_g, child_handle)
+                    stats.queue_time += clock() - tick
+                else:
+                    stats.duplicates += 1
+
+            # Fail cleanly once the node budget is used up
+            if self.max_nodes is not None and len(store) > self.max_nodes:
+                print("\nMemory limit exceeded")
+                return stop("memory_limit")
+
+            if len(best_g) > stats.peak_best_g:
+                stats.peak_best_g = len(best_g)
+
+            if progress is not None and stats.expansions % progress_every == 0:
+                stats.update_elapsed()
+                if progress(stats) is False:
+                    return stop("aborted")
+
+        stats.finish("exhausted")
+
+    # Follow cached best moves from node to the goal; returns the goal node, or None
+    # when a state on the way is not cached
+    def _cached_path(self, node):
+        while not self.goal_test(node.state):
+            entry = self.cache.lookup(self.goal_state, node.state)
+            if entry is None:
+                return None
+            move = entry[1]
+            for code, target in Node.neighbors(self.n)[node.zero]:
+                if code == move:
+                    node = node.apply(move, target, self.bits)
+                    break
+        return node
+
+    # Store every state on an optimal path to the goal with its exact distance
+    def _remember(self, goal):
+        if self.cache is None:
+            return
+        entries = [(goal.state, 0, None)]
+        node = goal
+        while node.parent is not None:
+            entries.append((node.parent.state, goal.g - node.parent.g, node.move))
+            node = node.parent
+        self.cache.store(self.goal_state, entries)
+
+    # Operator table for partial expansion: per blank cell, (move, target, delta) where
+    # delta[tile] is the change of the table part of h when tile slides from target into
+    # the blank (Manhattan distance, or misplaced count); None for other heuristics
+    def operator_table(self):
+        name = self.heuristic_name
+        if name not in ("manhattan", "manhattan_linear_conflict", "misplaced_tiles"):
+            return None
+        n = self.n
+        tiles = range(n * n)
+        goal_cell = [gx * n + gy for gx, gy in (self.goal_pos[tile] for tile in tiles)]
+        table = []
+        for zero, moves in enumerate(Node.neighbors(n)):
+            operators = []
+            for move, target in moves:
+                if name == "misplaced_tiles":
+                    delta = [0] + [(zero != goal_cell[tile]) - (target != goal_cell[tile])
+                                   for tile in tiles[1:]]
+                else:
+                    delta = [self.distance[tile][zero] - self.distance[tile][target]
+                             for tile in tiles]
+                operators.append((move, target, delta))
+            table.append(tuple(operators))
+        return tuple(table)
+
+    # Enhanced partial expansion A* (EPEA*). An open entry carries a threshold F, first
+    # the node's own f. Popping it stores only the children with f == F (f <= F on the
+    # first pop) and puts the node back with the smallest larger child f, so children
+    # that may never be needed are not stored or pushed. h changes come from
+    # operator_table(); the move back to the parent is never generated.
+    def EPEA_star(self, time_limit=None, open_list="heap"):
+        start_time = time.time()
+        processed_nodes = 1
+        clock = time.perf_counter
+
+        if open_list not in OPEN_LISTS:
+            raise ValueError(f"Unknown open list: {open_list}")
+
+        stats = self.stats = SearchStats()
+
+        if self.goal_test(self.root.state):
+            stats.finish("solved")
+            return self.solution(self.root), self.root.g, processed_nodes, True
+
+        operators = self.operator_table()
+        if operators is None:
+            operators = tuple(tuple((move, target, None) for move, target in moves)
+                              for moves in Node.neighbors(self.n))
+        conflicts = self.heuristic_name == "manhattan_linear_conflict"
+        bits, mask = self.bits, self.mask
+
+        frontier = OPEN_LISTS[open_list]()
+        store = NodeStore()
+        best_g = {}
+        threshold = array("H")       # current F of each handle's open entry
+
+        root = self.root
+        root.h = self.heuristic(root.state)
+        handle = store.add(root.state, root.zero, root.g, root.h)
+        best_g[root.state] = handle
+        threshold.append(root.g + root.h)
+        frontier.push(root.g + root.h, root.g, handle)
+
+        while frontier:
+
+            # Stop if time limit exceeded
+            if time_limit is not None and (time.time() - start_time) >= time_limit:
+                print("\nTime limit exceeded")
+                stats.finish("timeout")
+                return False
+
+            if len(frontier) > stats.peak_open:
+                stats.peak_open = len(frontier)
+
+            tick = clock()
+            handle = frontier.pop()
+            stats.queue_time += clock() - tick
+
+            state = store.states[handle]
+            if best_g[state] != handle:
+                stats.stale += 1
+                continue
+
+            g, h, zero = store.g[handle], store.h[handle], store.zero[handle]
+            if self.goal_test(state):
+                stats.finish("solved")
+                goal = store.chain(handle)
+                return self.solution(goal), g, processed_nodes, True
+
+            F = threshold[handle]
+            first = F == g + h
+            back = store.move[handle]
+            back = INVERSE[back] if back >= 0 else -1
+            next_f = None
+
+            tick = clock()
+            stats.expansions += 1
+            for move, target, delta in operators[zero]:
+                if move == back:
+                    continue
+                tile = (state >> (target * bits)) & mask
+                child_state = state ^ (tile << (target * bits)) ^ (tile << (zero * bits))
+                if delta is None:
+                    child_h = self.heuristic(child_state)
+                else:
+                    child_h = h + delta[tile]
+                    if conflicts:
+                        axis, lines = self._moved_lines(target, zero)
+                        child_h += 2 * (self._state_conflicts(child_state, axis, lines)
+                                        - self._state_conflicts(state, axis, lines))
+                f = g + 1 + child_h
+
+                # Later children wait for the parent's next pop
+                if f > F:
+                    if next_f is None or f < next_f:
+                        next_f = f
+                    continue
+                if f < F and not first:
+                    continue     # stored at an earlier pop
+
+                stats.generated += 1
+                best = best_g.get(child_state)
+                if best is None or g + 1 < store.g[best]:
+                    child_handle = store.add(child_state, target, g + 1, child_h, handle, move)
+                    best_g[child_state] = child_handle
+                    threshold.append(f)
+                    processed_nodes += 1
+                    frontier.push(f, g + 1, child_handle)
+                else:
+                    stats.duplicates += 1
+            stats.expand_time += clock() - tick
+
+            # Put the node back for the children it still holds
+            if next_f is not None:
+                threshold[handle] = next_f
+                frontier.push(next_f, g, handle)
+                stats.reinserted += 1
+
+            # Fail cleanly once the node budget is used up
+            if self.max_nodes is not None and len(store) > self.max_nodes:
+                print("\nMemory limit exceeded")
+                stats.finish("memory_limit")
+                return False
+
+            if len(best_g) > stats.peak_best_g:
+                stats.peak_best_g = len(best_g)
+
+        stats.finish("exhausted")
+
+    # SMA*: best-first tree search that keeps at most max_nodes nodes in memory. When
+    # full it drops the worst leaf (highest f, shallowest) and remembers its f in the
+    # parent, which is reopened to regenerate it later. f-values are backed up from
+    # children, so a returned path is optimal whenever the optimal path fits in the
+    # budget; once no path can fit, stats.status is "memory_limit". With a budget only a
+    # few nodes above the solution depth it can regenerate the same nodes for a very long
+    # time, so tight budgets need a time_limit.
+    def SMA_star(self, time_limit=None):
+        start_time = time.time()
+        processed_nodes = 1
+        infinity = float("inf")
+        limit = self.max_nodes if self.max_nodes is not None else infinity
+        stats = self.stats = SearchStats()
+
+        root = BoundedNode(self.root.state, 0, zero=self.root.zero)
+        root.h = self.heuristic(root.state)
+        root.f = root.h if root.h < limit else infinity
+        if self.goal_test(root.state):
+            stats.finish("solved")
+            return self.solution(root), 0, processed_nodes, True
+
+        best_first = []     # (key, -g, id, node): lowest key, deepest first
+        worst_first = []    # (-f, g, -id, node): highest f, shallowest first
+        used = 1
+
+        # Put a node on the open list: leaves by f, expanded nodes by their dropped children
+        def reopen(node, key):
+            node.open = True
+            node.key = key
+            heapq.heappush(best_first, (key, -node.g, node.id, node))
+            if not node.children:
+                heapq.heappush(worst_first, (-node.f, node.g, -node.id, node))
+
+        # Raise f of expanded nodes to the lowest bound among their children
+        def backup(node):
+            while node is not None:
+                lowest = min([child.f for child in node.children] + [node.forgotten])
+                if lowest <= node.f:
+                    break
+                node.f = lowest
+                if lowest == infinity and node.parent is not None:
+                    collapse(node)
+                node = node.parent
+
+        # Nothing below node fits the budget: drop its subtree and keep node as a dead
+        # leaf, dropped first when memory runs short (dead branches left in memory would
+        # crowd out the live path)
+        def collapse(node):
+            nonlocal used
+            stack = node.children
+            node.children = []
+            while stack:
+                child = stack.pop()
+                child.alive = child.open = False
+                stack.extend(child.children)
+                used -= 1
+            node.open = False
+            heapq.heappush(worst_first, (-infinity, node.g, -node.id, node))
+
+        reopen(root, root.f)
+
+        while True:
+
+            # Stop if time limit exceeded
+            if time_limit is not None and (time.time() - start_time) >= time_limit:
+                print("\nTime limit exceeded")
+                stats.finish("timeout")
+                return False
+
+            # Lowest-key open node, skipping outdated entries
+            while best_first:
+                key, _, _, node = best_first[0]
+                if node.open and node.alive and key == node.key:
+                    break
+                heapq.heappop(best_first)
+                stats.stale += 1
+            else:
+                stats.finish("exhausted")
+                return None
+
+            if node.key == infinity or root.f == infinity:
+                print("\nMemory limit exceeded")
+                stats.finish("memory_limit")
+                return False
+
+            if self.goal_test(node.state):
+                stats.finish("solved")
+                return self.solution(node), node.g, processed_nodes, True
+
+            # (Re)generate the children not currently in memory
+            node.open = False
+            node.forgotten = infinity
+            live = {child.state for child in node.children}
+            back = node.parent.state if node.parent is not None else None
+            stats.expansions += 1
+
+            for child in node.expand(self.n, self.bits):
+                if child.state == back or child.state in live:
+                    continue
+                child.h = self.update_heuristic(node, child)
+                child.f = max(node.f, child.g + child.h)
+                # A path costing f holds f + 1 nodes, which must fit in the budget
+                if child.f >= limit:
+                    child.f = infinity
+                node.children.append(child)
+                reopen(child, child.f)
+                used += 1
+                processed_nodes += 1
+                stats.generated += 1
+            backup(node)
+
+            # Drop worst leaves (dead leaves first) until the budget holds again
+            while used > limit and worst_first:
+                f, _, _, leaf = heapq.heappop(worst_first)
+                if not leaf.alive or leaf.children or leaf.parent is None:
+                    continue
+                if not leaf.open and leaf.f < infinity:
+                    continue
+                leaf.alive = leaf.open = False
+                parent = leaf.parent
+                parent.children.remove(leaf)
+                parent.forgotten = min(parent.forgotten, leaf.f)
+                if parent.forgotten < infinity:
+                    reopen(parent, parent.forgotten)
+                backup(parent)
+                used -= 1
+                stats.forgotten += 1
+
+            stats.peak_open = max(stats.peak_open, used)
+
+    # ARA* (anytime repairing A*): a weighted A* pass with f = g + weight * h finds a
+    # path fast, then the weight drops by weight_step and the search resumes with the
+    # states whose g improved, until the path is proven optimal. Yields (path, cost,
+    # bound) for each improved path; cost is at most bound times the optimal cost.
+    def ARA_star_solutions(self, time_limit=None, weight=3.0, weight_step=0.5):
+        start_time = time.time()
+        stats = self.stats = SearchStats()
+        self.processed_nodes = 1
+        goal = self.goal_state
+
+        # state -> [g, h, zero, parent state, move]
+        records = {self.root.state: [0, self.heuristic(self.root.state), self.root.zero,
+                                     None, None]}
+        if goal not in records:
+            records[goal] = [float("inf"), 0, None, None, None]
+
+        def key(state):
+            g, h = records[state][0], records[state][1]
+            return g + weight * h
+
+        opened = {self.root.state}     # states with a current open-list entry
+        inconsistent = set()           # closed states whose g improved in this pass
+        heap = [(key(self.root.state), 0, self.root.state)]
+        seq = 1
+        best_cost = float("inf")
+
+        while True:
+            closed = set()
+
+            # Expand until no open state can lead to a cheaper weighted path to the goal
+            while heap and key(goal) > heap[0][0]:
+
+                # Stop if time limit exceeded
+                if time_limit is not None and (time.time() - start_time) >= time_limit:
+                    stats.finish("timeout")
+                    return
+
+                priority, _, state = heapq.heappop(heap)
+                if state not in opened or priority != key(state):
+                    stats.stale += 1
+                    continue
+                opened.discard(state)
+                closed.add(state)
+
+                g, h, zero = records[state][:3]
+                node = Node(state, g, None, None, zero)
+                node.h = h
+                stats.expansions += 1
+                for child in node.expand(self.n, self.bits):
+                    stats.generated += 1
+                    record = records.get(child.state)
+                    if record is None:
+                        child.h = self.update_heuristic(node, child)
+                        record = records[child.state] = [float("inf"), child.h, child.zero,
+                                                         None, None]
+                        self.processed_nodes += 1
+                    elif record[2] is None:
+                        record[2] = child.zero     # the goal, first reached
+                    if child.g >= record[0]:
+                        stats.duplicates += 1
+                        continue
+                    record[0], record[3], record[4] = child.g, state, child.move
+                    if child.state in closed:
+                        inconsistent.add(child.state)
+                    else:
+                        opened.add(child.state)
+                        heapq.heappush(heap, (key(child.state), seq, child.state))
+                        seq += 1
+
+                if len(opened) > stats.peak_open:
+                    stats.peak_open = len(opened)
+
+            # Bound from the lowest unweighted f among states that may still improve
+            cost = records[goal][0]
+            if cost == float("inf"):
+                stats.finish("exhausted")
+                return
+            pending = opened | inconsistent
+            lower = min((records[state][0] + records[state][1] for state in pending),
+                        default=cost)
+            bound = min(weight, cost / lower) if lower > 0 else 1.0
+
+            if cost < best_cost:
+                best_cost = cost
+                stats.update_elapsed()
+                yield self.solution(self._record_chain(records, goal)), cost, max(bound, 1.0)
+
+            if bound <= 1.0:
+                stats.finish("solved")
+                return
+
+            # Lower the weight and resume from the open and inconsistent states
+            weight = max(1.0, weight - weight_step)
+            opened = pending
+            inconsistent = set()
+            heap = [(key(state), seq + i, state) for i, state in enumerate(opened)]
+            seq += len(heap)
+            heapq.heapify(heap)
+
+    # Node chain from the root to state through ARA* parent records
+    def _record_chain(self, records, state):
+        chain = []
+        while state is not None:
+            g, _, zero, parent, move = records[state]
+            chain.append((state, g, zero, move))
+            state = parent
+        node = None
+        for state, g, zero, move in reversed(chain):
+            node = Node(state, g, node, move, zero)
+        return node
+
+    # Anytime search: runs ARA_star_solutions until it proves optimality or time runs
+    # out, and returns the best path found as (path, cost, processed_nodes, solved).
+    # on_solution(path, cost, bound) sees each improvement; the final bound is in
+    # self.stats.bound.
+    def ARA_star(self, time_limit=None, weight=3.0, weight_step=0.5, on_solution=None):
+        if self.goal_test(self.root.state):
+            self.stats = SearchStats().finish("solved")
+            self.stats.bound = 1.0
+            return self.solution(self.root), 0, 1, True
+
+        best = None
+        for path, cost, bound in self.ARA_star_solutions(time_limit, weight, weight_step):
+            best = path, cost
+            self.stats.bound = bound
+            if on_solution is not None:
+                on_solution(path, cost, bound)
+
+        if best is None:
+            if self.stats.status == "timeout":
+                print("\nTime limit exceeded")
+                return False
+            return None
+        return best[0], best[1], self.processed_nodes, True
+
+    # IDA* search: iterative deepening on f over a single in-place board. On timeout the
+    # bound and the path to the current node are saved to the checkpoint path if given;
+    # resume replays such a file and continues the iteration at that node. Unsolvable
+    # boards return None right away instead of deepening forever.
+    def IDA_star(self, time_limit=None, checkpoint=None, resume=None):
+        if not self.solvable():
+            return None
+        start_time = time.time()
+        processed_nodes = 1
+
+        board = self.tiles(self.root.state)
+        goal = self.tiles(self.goal_state)
+        neighbors = Node.neighbors(self.n)
+        path = []              # move codes from root to the current board
+        timed_out = False
+        replay = []            # checkpointed moves still to walk down
+
+        # Depth-first search bounded by f; returns True once the goal is reached
+        def search(g, h, zero, last):
+            nonlocal processed_nodes, next_bound, timed_out, replay
+
+            f = g + h
+            if f > bound:
+                next_bound = min(next_bound, f)
+                return False
+            if h == 0 and board == goal:
+                return True
+
+            # Stop if time limit exceeded
+            if time_limit is not None and (time.time() - start_time) >= time_limit:
+                timed_out = True
+                return True
+
+            # While replaying, siblings before the checkpointed move were already searched
+            skip_to = None
+            if replay:
+                if len(path) < len(replay):
+                    skip_to = replay[len(path)]
+                else:
+                    replay = []
+
+            for move, target in neighbors[zero]:
+                if skip_to is not None:
+                    if move != skip_to:
+                        continue
+                    skip_to = None
+                # Never undo the previous move
+                if last is not None and move == INVERSE[last]:
+                    continue
+                child_h = self._apply_move(board, zero, target, h)
+                processed_nodes += 1
+                path.append((move, target))
+                if search(g + 1, child_h, target, move):
+                    return True
+                path.pop()
+                board[target], board[zero] = board[zero], 0
+            return False
+
+        root_h = self.heuristic(self.root.state)
+        bound, next_bound = root_h, float("inf")
+        if resume is not None:
+            bound, next_bound, replay, processed_nodes = load_ida_star(resume, self)
+            # Nodes on the replayed path are counted again on the way down
+            processed_nodes -= len(replay)
+        while True:
+            if search(0, root_h, self.root.zero, None):
+                break
+            # Whole reachable space exhausted
+            if next_bound == float("inf"):
+                return None
+            bound, next_bound = next_bound, float("inf")
+
+        if timed_out:
+            print("\nTime limit exceeded")
+            if checkpoint is not None:
+                save_ida_star(checkpoint, self, bound, next_bound,
+                              [move for move, _ in path], processed_nodes)
+            return False
+
+        node = self.root
+        for move, target in path:
+            node = node.apply(move, target, self.bits)
+        return self.solution(node), node.g, processed_nodes, True
+
+    # Bidirectional MM search: a forward frontier from the root and a backward one from
+    # the goal, each ordered by max(f, 2g) with the heuristic toward the other endpoint.
+    # The perfect table only knows the standard goal, so the backward direction then
+    # uses Manhattan + linear conflict.
+    def bidirectional(self, time_limit=None):
+        start_time = time.time()
+        processed_nodes = 1
+        stats = self.stats = SearchStats()
+
+        if self.goal_test(self.root.state):
+            stats.finish("solved")
+            return self.solution(self.root), self.root.g, processed_nodes, True
+
+        if self.heuristic_name == "pattern_database":
+            raise ValueError("Bidirectional search needs a heuristic toward the initial state")
+
+        # Heuristic toward the initial state for the backward direction
+        backward_heuristic = self.heuristic_name
+        if backward_heuristic == "perfect":
+            backward_heuristic = "manhattan_linear_conflict"
+        backward_tree = SearchTree(self.decode(self.goal_state), self.decode(self.root.state),
+                                   backward_heuristic)
+        forward = SearchFrontier(self, self.root)
+        backward = SearchFrontier(backward_tree, backward_tree.root)
+
+        best_cost = float("inf")    # cheapest path found through a meeting state
+        meeting = None              # (forward node, backward node)
+
+        while forward.open and backward.open:
+
+            # Stop if time limit exceeded
+            if time_limit is not None and (time.time() - start_time) >= time_limit:
+                print("\nTime limit exceeded")
+                stats.finish("timeout")
+                return False
+
+            # MM stopping rule: no remaining path can beat best_cost
+            forward_priority = forward.min_key(forward.by_priority)
+            backward_priority = backward.min_key(backward.by_priority)
+            bound = max(min(forward_priority, backward_priority),
+                        forward.min_key(forward.by_f), backward.min_key(backward.by_f),
+                        forward.min_key(forward.by_g) + backward.min_key(backward.by_g) + 1)
+            if best_cost <= bound:
+                break
+
+            if forward_priority <= backward_priority:
+                side, other = forward, backward
+            else:
+                side, other = backward, forward
+
+            node = side.pop()
+            stats.expansions += 1
+            for child in node.expand(self.n, self.bits):
+                stats.generated += 1
+                old = side.nodes.get(child.state)
+                if old is not None and old.g <= child.g:
+                    stats.duplicates += 1
+                    continue
+                child.h = side.tree.update_heuristic(node, child)
+                side.add(child)
+                processed_nodes += 1
+
+                match = other.nodes.get(child.state)
+                if match is not None and child.g + match.g < best_cost:
+                    best_cost = child.g + match.g
+                    meeting = (child, match) if side is forward else (match, child)
+            stats.peak_open = max(stats.peak_open, len(forward.open) + len(backward.open))
+
+        if meeting is None:
+            stats.finish("exhausted")
+            return None
+
+        # Stitch: forward chain to the meeting state, then backward parents to the goal
+        node, step = meeting[0], meeting[1].parent
+        while step is not None:
+            node = Node(step.state, node.g + 1, node, self._move_code(node.zero, step.zero), step.zero)
+            step = step.parent
+
+        stats.finish("solved")
+        return self.solution(node), node.g, processed_nodes, True
+
+    # Move code that takes the blank from cell zero to cell target
+    def _move_code(self, zero, target):
+        return {-self.n: 0, self.n: 1, -1: 2, 1: 3}[target - zero]
 
-    # Reconstruct solution path
-    @staticmethod     
-    def solution(node):
-        sol = []
+    # Compact Solution (start board and move letters) for the path ending at node
+    def solution(self, node):
+        letters = []
         current = node
 
-        while current is not None:
-            sol.append((current.state, current.action))
+        while current.parent is not None:
+            letters.append(LETTERS[current.move])
             current = current.parent
 
-        sol.reverse()
-        return sol
+        letters.reverse()
+        return Solution(self.n, self.tiles(current.state), "".join(letters), self.stats)
@@ -0,0 +1,192 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import time
+
+from Node import SearchTree
+from solution_cache import SolutionCache
+from run_test import (
+    HEURISTICS,
+    MAX_N,
+    MIN_N,
+    SEARCHES,
+    generate_goal_state,
+    validate_matrix,
+    is_solvable
+)
+
+CHECKPOINTED = ("A_star", "IDA_star")   # searches that can be saved and resumed
+
+
+# Read puzzles as (id, matrix) pairs from JSONL or blank-line-separated matrices
+def read_puzzles(path):
+    with open(path, "r") as file:
+        content = file.read()
+
+    stripped = content.lstrip()
+    if stripped.startswith("{") or stripped.startswith("["):
+        return _read_jsonl(content)
+    return _read_matrices(content)
+
+
+# One JSON value per line: {"id": ..., "board": [[...]]} or a bare matrix
+def _read_jsonl(content):
+    puzzles = []
+    for number, line in enumerate(content.splitlines(), 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if isinstance(record, dict):
+            puzzles.append((record.get("id", number), record["board"]))
+        else:
+            puzzles.append((number, record))
+    return puzzles
+
+
+# npuzzle.txt-style matrices separated by blank lines
+def _read_matrices(content):
+    puzzles = []
+    matrix = []
+    for line in content.splitlines() + [""]:
+        if line.strip():
+            matrix.append(list(map(int, line.split())))
+        elif matrix:
+            puzzles.append((len(puzzles) + 1, matrix))
+            matrix = []
+    return puzzles
+
+
+# Check a matrix before solving; returns (status, error) or None
+def check_puzzle(matrix):
+    n = len(matrix)
+    try:
+        if n < MIN_N or n > MAX_N:
+            raise ValueError(f"n must be between {MIN_N} and {MAX_N}")
+        if any(len(row) != n for row in matrix):
+            raise ValueError("Matrix must be square")
+        validate_matrix(matrix, n)
+    except ValueError as error:
+        return "invalid", str(error)
+    if not is_solvable(matrix, generate_goal_state(n)):
+        return "unsolvable", "puzzle is not solvable for the selected goal state"
+    return None
+
+
+# Solve one puzzle in a worker process and describe the outcome; an error (e.g. an
+# unknown heuristic or a missing table file) becomes that puzzle's record
+def solve_puzzle(puzzle_id, matrix, heuristic, algorithm, time_limit, cache_path=None,
+                 checkpoint_dir=None):
+    try:
+        return _solve_puzzle(puzzle_id, matrix, heuristic, algorithm, time_limit,
+                             cache_path, checkpoint_dir)
+    except Exception as error:
+        return {"id": puzzle_id, "status": "error", "error": str(error)}
+
+
+def _solve_puzzle(puzzle_id, matrix, heuristic, algorithm, time_limit, cache_path,
+                  checkpoint_dir):
+    start_time = time()
+    cache = SolutionCache(cache_path) if cache_path else None
+    tree = SearchTree(matrix, generate_goal_state(len(matrix)), heuristic, cache=cache)
+
+    # Searches that stop on the time limit are saved and continued by the next run
+    checkpoint = resume = None
+    if checkpoint_dir and algorithm in CHECKPOINTED:
+        checkpoint = os.path.join(checkpoint_dir, f"{puzzle_id}.ckpt")
+        resume = checkpoint if os.path.exists(checkpoint) else None
+
+    # Keep search messages out of the JSONL stream
+    with contextlib.redirect_stdout(io.StringIO()):
+        if checkpoint is not None:
+            result = getattr(tree, algorithm)(time_limit, checkpoint=checkpoint, resume=resume)
+        else:
+            result = SEARCHES[algorithm](tree, time_limit)
+    elapsed = time() - start_time
+    if cache is not None:
+        cache.close()
+
+    record = {"id": puzzle_id, "status": "solved", "moves": None, "cost": None,
+              "processed_nodes": None, "time": round(elapsed, 6)}
+    if result is False:
+        out_of_memory = tree.stats is not None and tree.stats.status == "memory_limit"
+        record["status"] = "memory_limit" if out_of_memory else "timeout"
+    elif not result:
+        record["status"] = "failed"
+    else:
+        path, cost, processed_nodes, solved = result
+        record["moves"] = path.names()
+        record["cost"] = cost
+        record["processed_nodes"] = processed_nodes
+        # Anytime searches may stop early with a suboptimal path
+        if tree.stats is not None and tree.stats.bound is not None:
+            record["bound"] = round(tree.stats.bound, 4)
+    if resume is not None:
+        record["resumed"] = True
+    if checkpoint is not None and result is not False and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return record
+
+
+# Solve puzzles across a process pool, writing JSONL records as they complete
+def run_batch(puzzles, out, heuristic="manhattan_linear_conflict", algorithm="A_star",
+              time_limit=None, workers=None, cache_path=None, checkpoint_dir=None):
+    counts = {}
+
+    def emit(record):
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for puzzle_id, matrix in puzzles:
+            problem = check_puzzle(matrix)
+            if problem is not None:
+                status, error = problem
+                emit({"id": puzzle_id, "status": status, "error": error})
+                continue
+            futures.append(pool.submit(solve_puzzle, puzzle_id, matrix,
+                                       heuristic, algorithm, time_limit, cache_path,
+                                       checkpoint_dir))
+
+        for future in as_completed(futures):
+            emit(future.result())
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many N-puzzles in parallel")
+    parser.add_argument("input", help="JSONL file or blank-line-separated matrices")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--heuristic", default="manhattan_linear_conflict", choices=HEURISTICS)
+    parser.add_argument("--algorithm", default="A_star", choices=list(SEARCHES))
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per puzzle")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", help="SQLite solution cache shared across runs (A_star only)")
+    parser.add_argument("--checkpoint-dir",
+                        help="save timed-out A_star/IDA_star searches here and resume them")
+    args = parser.parse_args(argv)
+
+    puzzles = read_puzzles(args.input)
+
+    if args.output:
+        with open(args.output, "w") as out:
+            counts = run_batch(puzzles, out, args.heuristic, args.algorithm,
+                               args.time_limit, args.workers, args.cache,
+                               args.checkpoint_dir)
+    else:
+        counts = run_batch(puzzles, sys.stdout, args.heuristic, args.algorithm,
+                           args.time_limit, args.workers, args.cache,
+                           args.checkpoint_dir)
+
+    summary = ", ".join(f"{status}={count}" for status, count in sorted(counts.items()))
+    print(f"Processed {len(puzzles)} puzzles: {summary}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from time import perf_counter, time
+
+from Node import SearchTree
+from run_test import SEARCHES, generate_goal_state, is_solvable
+
+# Korf (1985) 4x4 instances as (id, tiles, optimal moves), in Korf's layout:
+# row-major tiles with the goal 0 1 2 ... 15 (blank first); load_instances()
+# reads the same "id tiles... optimal" lines from a file.
+KORF_INSTANCES = [
+    (1, (14, 13, 15, 7, 11, 12, 9, 5, 6, 0, 2, 1, 4, 8, 10, 3), 57),
+    (2, (13, 5, 4, 10, 9, 12, 8, 14, 2, 3, 7, 1, 0, 15, 11, 6), 55),
+    (3, (14, 7, 8, 2, 13, 11, 10, 4, 9, 12, 5, 0, 3, 6, 1, 15), 59),
+    (4, (5, 12, 10, 7, 15, 11, 14, 0, 8, 2, 1, 13, 3, 4, 9, 6), 56),
+    (5, (4, 7, 14, 13, 10, 3, 9, 12, 11, 5, 6, 15, 1, 2, 8, 0), 56),
+    (6, (14, 7, 1, 9, 12, 3, 6, 15, 8, 11, 2, 5, 10, 0, 4, 13), 52),
+    (7, (2, 11, 15, 5, 13, 4, 6, 7, 12, 8, 10, 1, 9, 3, 14, 0), 52),
+    (8, (12, 11, 15, 3, 8, 0, 4, 2, 6, 13, 9, 5, 14, 1, 10, 7), 50),
+    (9, (3, 14, 9, 11, 5, 4, 8, 2, 13, 12, 6, 7, 10, 1, 15, 0), 46),
+    (10, (13, 11, 8, 9, 0, 15, 7, 10, 4, 3, 6, 14, 5, 12, 2, 1), 59),
+    (11, (5, 9, 13, 14, 6, 3, 7, 12, 10, 8, 4, 0, 15, 2, 11, 1), 57),
+    (12, (14, 1, 9, 6, 4, 8, 12, 5, 7, 2, 3, 0, 10, 11, 13, 15), 45),
+    (13, (3, 6, 5, 2, 10, 0, 15, 14, 1, 4, 13, 12, 9, 8, 11, 7), 46),
+    (14, (7, 6, 8, 1, 11, 5, 14, 10, 3, 4, 9, 13, 15, 2, 0, 12), 59),
+    (15, (13, 11, 4, 12, 1, 8, 9, 15, 6, 5, 14, 2, 7, 3, 10, 0), 62),
+    (16, (1, 3, 2, 5, 10, 9, 15, 6, 8, 14, 13, 11, 12, 4, 7, 0), 42),
+    (17, (15, 14, 0, 4, 11, 1, 6, 13, 7, 5, 8, 9, 3, 2, 10, 12), 66),
+    (18, (6, 0, 14, 12, 1, 15, 9, 10, 11, 4, 7, 2, 8, 3, 5, 13), 55),
+    (19, (7, 11, 8, 3, 14, 0, 6, 15, 1, 4, 13, 9, 5, 12, 2, 10), 46),
+    (20, (6, 12, 11, 3, 13, 7, 9, 15, 2, 14, 8, 10, 4, 1, 5, 0), 52),
+    (21, (12, 8, 14, 6, 11, 4, 7, 0, 5, 1, 10, 15, 3, 13, 9, 2), 54),
+    (22, (14, 3, 9, 1, 15, 8, 4, 5, 11, 7, 10, 13, 0, 2, 12, 6), 59),
+    (23, (10, 9, 3, 11, 0, 13, 2, 14, 5, 6, 4, 7, 8, 15, 1, 12), 49),
+    (24, (7, 3, 14, 13, 4, 1, 10, 8, 5, 12, 9, 11, 2, 15, 6, 0), 54),
+    (25, (11, 4, 2, 7, 1, 0, 10, 15, 6, 9, 14, 8, 3, 13, 5, 12), 52),
+    (26, (5, 7, 3, 12, 15, 13, 14, 8, 0, 10, 9, 6, 1, 4, 2, 11), 58),
+    (27, (14, 1, 8, 15, 2, 6, 0, 3, 9, 12, 10, 13, 4, 7, 5, 11), 53),
+    (28, (13, 14, 6, 12, 4, 5, 1, 0, 9, 3, 10, 2, 15, 11, 8, 7), 52),
+    (29, (9, 8, 0, 2, 15, 1, 4, 14, 3, 10, 7, 5, 11, 13, 6, 12), 54),
+    (30, (12, 15, 2, 6, 1, 14, 4, 8, 5, 3, 7, 0, 10, 13, 9, 11), 47),
+    (31, (12, 8, 15, 13, 1, 0, 5, 4, 6, 3, 2, 11, 9, 7, 14, 10), 50),
+    (32, (14, 10, 9, 4, 13, 6, 5, 8, 2, 12, 7, 0, 1, 3, 11, 15), 59),
+    (33, (14, 3, 5, 15, 11, 6, 13, 9, 0, 10, 2, 12, 4, 1, 7, 8), 60),
+    (34, (6, 11, 7, 8, 13, 2, 5, 4, 1, 10, 3, 9, 14, 0, 12, 15), 52),
+    (35, (1, 6, 12, 14, 3, 2, 15, 8, 4, 5, 13, 9, 0, 7, 11, 10), 55),
+    (36, (12, 6, 0, 4, 7, 3, 15, 1, 13, 9, 8, 11, 2, 14, 5, 10), 52),
+    (37, (8, 1, 7, 12, 11, 0, 10, 5, 9, 15, 6, 13, 14, 2, 3, 4), 58),
+    (38, (7, 15, 8, 2, 13, 6, 3, 12, 11, 0, 4, 10, 9, 5, 1, 14), 53),
+    (39, (9, 0, 4, 10, 1, 14, 15, 3, 12, 6, 5, 7, 11, 13, 8, 2), 49),
+    (40, (11, 5, 1, 14, 4, 12, 10, 0, 2, 7, 13, 3, 9, 15, 6, 8), 54),
+    (41, (8, 13, 10, 9, 11, 3, 15, 6, 0, 1, 2, 14, 12, 5, 4, 7), 54),
+    (42, (4, 5, 7, 2, 9, 14, 12, 13, 0, 3, 6, 11, 8, 1, 15, 10), 42),
+    (43, (11, 15, 14, 13, 1, 9, 10, 4, 3, 6, 2, 12, 7, 5, 8, 0), 64),
+    (44, (12, 9, 0, 6, 8, 3, 5, 14, 2, 4, 11, 7, 10, 1, 15, 13), 50),
+    (45, (3, 14, 9, 7, 12, 15, 0, 4, 1, 8, 5, 6, 11, 10, 2, 13), 51),
+    (46, (8, 4, 6, 1, 14, 12, 2, 15, 13, 10, 9, 5, 3, 7, 0, 11), 49),
+    (47, (6, 10, 1, 14, 15, 8, 3, 5, 13, 0, 2, 7, 4, 9, 11, 12), 47),
+    (48, (8, 11, 4, 6, 7, 3, 10, 9, 2, 12, 15, 13, 0, 1, 5, 14), 49),
+    (49, (10, 0, 2, 4, 5, 1, 6, 12, 11, 13, 9, 7, 15, 3, 14, 8), 59),
+    (50, (12, 5, 13, 11, 2, 10, 0, 9, 7, 8, 4, 3, 14, 6, 15, 1), 53),
+    (51, (10, 2, 8, 4, 15, 0, 1, 14, 11, 13, 3, 6, 9, 7, 5, 12), 56),
+    (52, (10, 8, 0, 12, 3, 7, 6, 2, 1, 14, 4, 11, 15, 13, 9, 5), 56),
+    (53, (14, 9, 12, 13, 15, 4, 8, 10, 0, 2, 1, 7, 3, 11, 5, 6), 64),
+    (54, (12, 11, 0, 8, 10, 2, 13, 15, 5, 4, 7, 3, 6, 9, 14, 1), 56),
+    (55, (13, 8, 14, 3, 9, 1, 0, 7, 15, 5, 4, 10, 12, 2, 6, 11), 41),
+    (56, (3, 15, 2, 5, 11, 6, 4, 7, 12, 9, 1, 0, 13, 14, 10, 8), 55),
+    (57, (5, 11, 6, 9, 4, 13, 12, 0, 8, 2, 15, 10, 1, 7, 3, 14), 50),
+    (58, (5, 0, 15, 8, 4, 6, 1, 14, 10, 11, 3, 9, 7, 12, 2, 13), 51),
+    (59, (15, 14, 6, 7, 10, 1, 0, 11, 12, 8, 4, 9, 2, 5, 13, 3), 57),
+    (60, (11, 14, 13, 1, 2, 3, 12, 4, 15, 7, 9, 5, 10, 6, 8, 0), 66),
+    (61, (6, 13, 3, 2, 11, 9, 5, 10, 1, 7, 12, 14, 8, 4, 0, 15), 45),
+    (62, (4, 6, 12, 0, 14, 2, 9, 13, 11, 8, 3, 15, 7, 10, 1, 5), 57),
+    (63, (8, 10, 9, 11, 14, 1, 7, 15, 13, 4, 0, 12, 6, 2, 5, 3), 56),
+    (64, (5, 2, 14, 0, 7, 8, 6, 3, 11, 12, 13, 15, 4, 10, 9, 1), 51),
+    (65, (7, 8, 3, 2, 10, 12, 4, 6, 11, 13, 5, 15, 0, 1, 9, 14), 47),
+    (66, (11, 6, 14, 12, 3, 5, 1, 15, 8, 0, 10, 13, 9, 7, 4, 2), 61),
+    (67, (7, 1, 2, 4, 8, 3, 6, 11, 10, 15, 0, 5, 14, 12, 13, 9), 50),
+    (68, (7, 3, 1, 13, 12, 10, 5, 2, 8, 0, 6, 11, 14, 15, 4, 9), 51),
+    (69, (6, 0, 5, 15, 1, 14, 4, 9, 2, 13, 8, 10, 11, 12, 7, 3), 53),
+    (70, (15, 1, 3, 12, 4, 0, 6, 5, 2, 8, 14, 9, 13, 10, 7, 11), 52),
+    (71, (5, 7, 0, 11, 12, 1, 9, 10, 15, 6, 2, 3, 8, 4, 13, 14), 44),
+    (72, (12, 15, 11, 10, 4, 5, 14, 0, 13, 7, 1, 2, 9, 8, 3, 6), 56),
+    (73, (6, 14, 10, 5, 15, 8, 7, 1, 3, 4, 2, 0, 12, 9, 11, 13), 49),
+    (74, (14, 13, 4, 11, 15, 8, 6, 9, 0, 7, 3, 1, 2, 10, 12, 5), 56),
+    (75, (14, 4, 0, 10, 6, 5, 1, 3, 9, 2, 13, 15, 12, 7, 8, 11), 48),
+    (76, (15, 10, 8, 3, 0, 6, 9, 5, 1, 14, 13, 11, 7, 2, 12, 4), 57),
+    (77, (0, 13, 2, 4, 12, 14, 6, 9, 15, 1, 10, 3, 11, 5, 8, 7), 54),
+    (78, (3, 14, 13, 6, 4, 15, 8, 9, 5, 12, 10, 0, 2, 7, 1, 11), 53),
+    (79, (0, 1, 9, 7, 11, 13, 5, 3, 14, 12, 4, 2, 8, 6, 10, 15), 42),
+    (80, (11, 0, 15, 8, 13, 12, 3, 5, 10, 1, 4, 6, 14, 9, 7, 2), 57),
+    (81, (13, 0, 9, 12, 11, 6, 3, 5, 15, 8, 1, 10, 4, 14, 2, 7), 53),
+    (82, (14, 10, 2, 1, 13, 9, 8, 11, 7, 3, 6, 12, 15, 5, 4, 0), 62),
+    (83, (12, 3, 9, 1, 4, 5, 10, 2, 6, 11, 15, 0, 14, 7, 13, 8), 49),
+    (84, (15, 8, 10, 7, 0, 12, 14, 1, 5, 9, 6, 3, 13, 11, 4, 2), 55),
+    (85, (4, 7, 13, 10, 1, 2, 9, 6, 12, 8, 14, 5, 3, 0, 11, 15), 44),
+    (86, (6, 0, 5, 10, 11, 12, 9, 2, 1, 7, 4, 3, 14, 8, 13, 15), 45),
+    (87, (9, 5, 11, 10, 13, 0, 2, 1, 8, 6, 14, 12, 4, 7, 3, 15), 52),
+    (88, (15, 2, 12, 11, 14, 13, 9, 5, 1, 3, 8, 7, 0, 10, 6, 4), 65),
+    (89, (11, 1, 7, 4, 10, 13, 3, 8, 9, 14, 0, 15, 6, 5, 2, 12), 54),
+    (90, (5, 4, 7, 1, 11, 12, 14, 15, 10, 13, 8, 6, 2, 0, 9, 3), 50),
+    (91, (9, 7, 5, 2, 14, 15, 12, 10, 11, 3, 6, 1, 8, 13, 0, 4), 57),
+    (92, (3, 2, 7, 9, 0, 15, 12, 4, 6, 11, 5, 14, 8, 13, 10, 1), 57),
+    (93, (13, 9, 14, 6, 12, 8, 1, 2, 3, 4, 0, 7, 5, 10, 11, 15), 46),
+    (94, (5, 7, 11, 8, 0, 14, 9, 13, 10, 12, 3, 15, 6, 1, 4, 2), 53),
+    (95, (4, 3, 6, 13, 7, 15, 9, 0, 10, 5, 8, 11, 2, 12, 1, 14), 50),
+    (96, (1, 7, 15, 14, 2, 6, 4, 9, 12, 11, 13, 3, 0, 8, 5, 10), 49),
+    (97, (9, 14, 5, 7, 8, 15, 1, 2, 10, 4, 13, 6, 12, 0, 11, 3), 44),
+    (98, (0, 11, 3, 12, 5, 2, 1, 9, 8, 10, 14, 15, 7, 4, 13, 6), 54),
+    (99, (7, 15, 4, 0, 10, 9, 2, 5, 12, 11, 13, 6, 1, 3, 14, 8), 57),
+    (100, (11, 4, 0, 8, 6, 10, 5, 13, 12, 7, 14, 3, 1, 2, 9, 15), 54),
+]
+
+# Example boards from the project report
+REPORT_INSTANCES = [
+    ("report-3x3", [[1, 0, 2], [3, 5, 4], [6, 8, 7]], 25),
+    ("report-4x4", [[5, 1, 15, 7], [8, 4, 2, 11], [0, 6, 3, 14], [12, 9, 10, 13]], 44),
+    ("report-5x5", [[11, 1, 2, 3, 14], [12, 7, 9, 10, 13], [6, 8, 18, 5, 4],
+                    [21, 16, 17, 19, 15], [22, 23, 0, 24, 20]], 38),
+]
+
+DEFAULT_HEURISTICS = ["manhattan_linear_conflict", "manhattan"]
+DEFAULT_ALGORITHMS = ["A_star", "IDA_star", "bidirectional"]
+
+
+# Boards reached by seeded random walks of the blank from the goal (no immediate undo)
+def random_walk_instances(n, count, length, seed=0):
+    rng = random.Random(seed)
+    instances = []
+    for number in range(count):
+        board = generate_goal_state(n)
+        x, y = n - 1, n - 1
+        previous = None
+        for _ in range(length):
+            steps = [(x + dx, y + dy) for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                     if 0 <= x + dx < n and 0 <= y + dy < n and (x + dx, y + dy) != previous]
+            nx, ny = rng.choice(steps)
+            board[x][y], board[nx][ny] = board[nx][ny], board[x][y]
+            previous = (x, y)
+            x, y = nx, ny
+        instances.append((f"walk-{n}x{n}-{length}-{seed}-{number}", board, None))
+    return instances
+
+
+# Uniformly random boards, keeping only solvable ones
+def random_instances(n, count, seed=0):
+    rng = random.Random(seed)
+    goal_state = generate_goal_state(n)
+    instances = []
+    while len(instances) < count:
+        tiles = list(range(n * n))
+        rng.shuffle(tiles)
+        board = [tiles[i * n:(i + 1) * n] for i in range(n)]
+        if is_solvable(board, goal_state):
+            instances.append((f"random-{n}x{n}-{seed}-{len(instances)}", board, None))
+    return instances
+
+
+# Korf instance converted to this project's goal (1 ... 15, 0): rotating the board
+# by 180 degrees and relabelling tile t as 16 - t maps Korf's goal onto ours
+def korf_board(tiles):
+    flipped = [16 - tile if tile else 0 for tile in reversed(tiles)]
+    return [flipped[i * 4:(i + 1) * 4] for i in range(4)]
+
+
+def korf_instances(ids=None):
+    return [(f"korf-{number}", korf_board(tiles), optimal)
+            for number, tiles, optimal in KORF_INSTANCES if ids is None or number in ids]
+
+
+# Korf-format file: "id tile0 ... tile15 [optimal]" per line
+def load_instances(path):
+    instances = []
+    with open(path, "r") as file:
+        for line in file:
+            values = list(map(int, line.split()))
+            if not values:
+                continue
+            optimal = values[17] if len(values) > 17 else None
+            instances.append((f"korf-{values[0]}", korf_board(values[1:17]), optimal))
+    return instances
+
+
+# Run one search and return its measurements
+def run_case(name, board, heuristic, algorithm, time_limit=None, optimal=None, measure_memory=True):
+    goal_state = generate_goal_state(len(board))
+    record = {"instance": name, "n": len(board), "heuristic": heuristic, "algorithm": algorithm}
+
+    # Keep search messages out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = time()
+        result = SEARCHES[algorithm](SearchTree(board, goal_state, heuristic), time_limit)
+        record["time"] = round(time() - start_time, 6)
+
+        # Separate pass for memory: tracemalloc slows the search down
+        if measure_memory:
+            tracemalloc.start()
+            SEARCHES[algorithm](SearchTree(board, goal_state, heuristic), time_limit)
+            record["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    if result is False:
+        record["status"] = "timeout"
+    elif not result:
+        record["status"] = "failed"
+    else:
+        record["status"] = "solved"
+        record["cost"] = result[1]
+        record["nodes"] = result[2]
+        if optimal is not None and result[1] != optimal:
+            record["status"] = "wrong_cost"
+    return record
+
+
+# Sweep every heuristic x algorithm combination over the instances
+def run_suite(instances, heuristics=None, algorithms=None, time_limit=None,
+              measure_memory=True, progress=None):
+    results = []
+    for name, board, optimal in instances:
+        for heuristic in heuristics or DEFAULT_HEURISTICS:
+            for algorithm in algorithms or DEFAULT_ALGORITHMS:
+                record = run_case(name, board, heuristic, algorithm, time_limit,
+                                  optimal, measure_memory)
+                results.append(record)
+                if progress is not None:
+                    progress(record)
+    return results
+
+
+# Manhattan + linear conflict computed directly from goal_pos, without the
+# precomputed tables; reference for heuristic_timing
+def direct_heuristic(tree, state):
+    n = tree.n
+    tiles = tree.tiles(state)
+    total = 0
+    for k, tile in enumerate(tiles):
+        if tile != 0:
+            gx, gy = tree.goal_pos[tile]
+            total += abs(k // n - gx) + abs(k % n - gy)
+
+    for axis in (0, 1):
+        for line in range(n):
+            coords = []
+            for i in range(n):
+                tile = tiles[line * n + i] if axis == 0 else tiles[i * n + line]
+                if tile != 0 and tree.goal_pos[tile][axis] == line:
+                    coords.append(tree.goal_pos[tile][1 - axis])
+            total += 2 * SearchTree._count_inversions(coords)
+    return total
+
+
+# Table build time and Manhattan + linear conflict evaluation time, table vs direct
+def heuristic_timing(n, count=2000, seed=0):
+    goal_state = generate_goal_state(n)
+    SearchTree._conflict_tables.pop(n, None)
+    start_time = perf_counter()
+    tree = SearchTree(goal_state, goal_state)
+    build_time = perf_counter() - start_time
+
+    states = [tree.encode(board) for _, board, _ in random_instances(n, count, seed)]
+
+    start_time = perf_counter()
+    for state in states:
+        tree.heuristic(state)
+    table_time = perf_counter() - start_time
+
+    start_time = perf_counter()
+    for state in states:
+        direct_heuristic(tree, state)
+    direct_time = perf_counter() - start_time
+
+    return {"n": n, "build_time": round(build_time, 6),
+            "table_us": round(table_time / count * 1e6, 3),
+            "direct_us": round(direct_time / count * 1e6, 3),
+            "speedup": round(direct_time / table_time, 2)}
+
+
+def _key(record):
+    return record["instance"], record["heuristic"], record["algorithm"]
+
+
+# Regressions of results against a baseline: nodes and peak memory beyond threshold,
+# wall time beyond time_threshold (timing is noisier), and lost solutions
+def compare(results, baseline, threshold=0.05, time_threshold=0.25):
+    previous = {_key(record): record for record in baseline}
+    regressions = []
+
+    for record in results:
+        old = previous.get(_key(record))
+        if old is None:
+            continue
+        label = "/".join(_key(record))
+
+        if old["status"] == "solved" and record["status"] != "solved":
+            regressions.append(f"{label}: status {old['status']} -> {record['status']}")
+            continue
+        if record["status"] != "solved":
+            continue
+
+        for field, limit in (("nodes", threshold), ("peak_memory", threshold),
+                             ("time", time_threshold)):
+            if field in old and field in record and old[field] > 0:
+                change = record[field] / old[field] - 1
+                if change > limit:
+                    regressions.append(f"{label}: {field} {old[field]} -> {record[field]} "
+                                       f"(+{change:.0%})")
+    return regressions
+
+
+def _suite(args):
+    if args.suite == "report":
+        return REPORT_INSTANCES
+    if args.suite == "korf":
+        if args.korf_file:
+            return load_instances(args.korf_file)[:args.count]
+        return korf_instances()[:args.count]
+    if args.suite == "walk":
+        return random_walk_instances(args.n, args.count, args.walk_length, args.seed)
+    return random_instances(args.n, args.count, args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark N-puzzle searches")
+    parser.add_argument("--suite", default="report", choices=["report", "korf", "walk", "random"])
+    parser.add_argument("--n", type=int, default=3, help="board size for walk/random suites")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--walk-length", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--korf-file", help="Korf-format instance file (default: built-in list)")
+    parser.add_argument("--heuristics", nargs="+", default=DEFAULT_HEURISTICS)
+    parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS,
+                        choices=list(SEARCHES))
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.05)
+    parser.add_argument("--time-threshold", type=float, default=0.25)
+    parser.add_argument("--heuristic-timing", action="store_true",
+                        help="also time heuristic tables against direct evaluation (n=3..6)")
+    args = parser.parse_args(argv)
+
+    def progress(record):
+        print(f"{record['instance']:<24} {record['heuristic']:<26} {record['algorithm']:<14} "
+              f"{record['status']:<8} nodes={record.get('nodes')} time={record['time']:.3f}"
+              f" peak={record.get('peak_memory')}", file=sys.stderr)
+
+    results = run_suite(_suite(args), args.heuristics, args.algorithms, args.time_limit,
+                        not args.no_memory, progress)
+
+    report = {"python": platform.python_version(), "suite": args.suite, "results": results}
+    if args.heuristic_timing:
+        report["heuristic_timing"] = [heuristic_timing(n) for n in range(3, 7)]
+        for timing in report["heuristic_timing"]:
+            print(f"heuristic n={timing['n']} build={timing['build_time']:.4f}s "
+                  f"table={timing['table_us']}us direct={timing['direct_us']}us "
+                  f"speedup={timing['speedup']}x", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold, args.time_threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import json
+import os
+import sys
+import zlib
+from array import array
+
+MAGIC = b"NPUZCKPT"
+VERSION = 1
+
+
+# Checkpoint file: MAGIC, a length-prefixed JSON header, then zlib-compressed sections
+# (little-endian arrays, or raw bytes) in the order listed in the header
+def write_checkpoint(path, header, sections):
+    header = dict(header, version=VERSION, sections=[])
+    blobs = []
+    for name, values in sections.items():
+        if isinstance(values, array):
+            typecode = values.typecode
+            if sys.byteorder == "big":
+                values = array(typecode, values)
+                values.byteswap()
+            data = values.tobytes()
+        else:
+            typecode, data = None, bytes(values)
+        blob = zlib.compress(data, 1)
+        header["sections"].append((name, typecode, len(blob)))
+        blobs.append(blob)
+
+    encoded = json.dumps(header).encode()
+    # Written next to the target and renamed, so a killed run never leaves half a file
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(MAGIC)
+        file.write(len(encoded).to_bytes(4, "little"))
+        file.write(encoded)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temporary, path)
+
+
+# (header, {name: array or bytes}) of a checkpoint file
+def read_checkpoint(path):
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a search checkpoint")
+        size = int.from_bytes(file.read(4), "little")
+        header = json.loads(file.read(size))
+        if header.get("version") != VERSION:
+            raise ValueError(f"Unsupported checkpoint version {header.get('version')}")
+
+        sections = {}
+        for name, typecode, size in header["sections"]:
+            data = zlib.decompress(file.read(size))
+            if typecode is None:
+                sections[name] = data
+                continue
+            values = array(typecode)
+            values.frombytes(data)
+            if sys.byteorder == "big":
+                values.byteswap()
+            sections[name] = values
+    return header, sections
+
+
+# Header fields that tie a checkpoint to one puzzle and search
+def _problem(tree, algorithm):
+    return {"algorithm": algorithm, "n": tree.n, "heuristic": tree.heuristic_name,
+            "root": tree.tiles(tree.root.state), "goal": tree.tiles(tree.goal_state)}
+
+
+# Read a checkpoint and check that it was written for this tree and algorithm
+def load_checkpoint(path, tree, algorithm):
+    header, sections = read_checkpoint(path)
+    expected = _problem(tree, algorithm)
+    for key, value in expected.items():
+        if header.get(key) != value:
+            raise ValueError(f"Checkpoint {path} does not match this search ({key} differs)")
+    return header, sections
+
+
+def _state_width(tree):
+    return (tree.n * tree.n * tree.bits + 7) // 8
+
+
+# Save a stopped A* search: the node store (from which best_g is rebuilt), the open
+# list in rebuild order, the processed-node count and the stats counters
+def save_a_star(path, tree, store, frontier, open_list, processed_nodes, stats):
+    width = _state_width(tree)
+    fs, handles = array("H"), array("I")
+    for f, handle in frontier.entries():
+        fs.append(f)
+        handles.append(handle)
+
+    header = dict(_problem(tree, "A_star"), open_list=open_list,
+                  processed_nodes=processed_nodes, stats=stats.to_dict())
+    write_checkpoint(path, header, {
+        "states": b"".join(state.to_bytes(width, "little") for state in store.states),
+        "g": store.g, "h": store.h, "parent": store.parent, "move": store.move,
+        "zero": store.zero, "open_f": fs, "open_handle": handles,
+    })
+
+
+# Refill an empty NodeStore, best_g table and open list from an A* checkpoint;
+# returns the processed-node count and restores the stats counters
+def load_a_star(path, tree, store, best_g, frontier, open_list, stats):
+    header, sections = load_checkpoint(path, tree, "A_star")
+    if header["open_list"] != open_list:
+        raise ValueError(f"Checkpoint used the {header['open_list']} open list")
+
+    width = _state_width(tree)
+    data = sections["states"]
+    store.states = [int.from_bytes(data[i:i + width], "little")
+                    for i in range(0, len(data), width)]
+    for name in ("g", "h", "parent", "move", "zero"):
+        setattr(store, name, sections[name])
+
+    # A state is only re-added with a lower g, so its newest handle is the best one
+    for handle, state in enumerate(store.states):
+        best_g[state] = handle
+
+    g = store.g
+    handles = sections["open_handle"]
+    frontier.push_many(sections["open_f"], [g[handle] for handle in handles], handles)
+    stats.resume(header["stats"])
+    return header["processed_nodes"]
+
+
+# Save a stopped IDA* search: the f bound of the current iteration, the smallest f
+# seen above it so far and the moves to the node the search stopped at
+def save_ida_star(path, tree, bound, next_bound, moves, processed_nodes):
+    header = dict(_problem(tree, "IDA_star"), bound=bound,
+                  next_bound=None if next_bound == float("inf") else next_bound,
+                  processed_nodes=processed_nodes)
+    write_checkpoint(path, header, {"path": array("b", moves)})
+
+
+# (bound, next_bound, moves, processed_nodes) of an IDA* checkpoint
+def load_ida_star(path, tree):
+    header, sections = load_checkpoint(path, tree, "IDA_star")
+    next_bound = header["next_bound"]
+    return (header["bound"], float("inf") if next_bound is None else next_bound,
+            list(sections["path"]), header["processed_nodes"])
+
+
+# Continue the search saved in a checkpoint file on the puzzle it was written for.
+# Returns the search's result tuple; a search that stops again overwrites the file.
+def resume_search(path, time_limit=None, **options):
+    from Node import SearchTree
+
+    header, _ = read_checkpoint(path)
+    n = header["n"]
+    rows = lambda tiles: [tiles[i * n:(i + 1) * n] for i in range(n)]
+    tree = SearchTree(rows(header["root"]), rows(header["goal"]), header["heuristic"])
+    if header["algorithm"] == "A_star":
+        options.setdefault("open_list", header["open_list"])
+    search = getattr(tree, header["algorithm"])
+    return search(time_limit, checkpoint=path, resume=path, **options)
@@ -0,0 +1,206 @@
+import time
+from collections import deque
+
+from Node import INVERSE, Node, SearchTree
+
+FINISH = 3   # side of the bottom-right block left to an optimal search
+
+
+class ConstructiveSolver:
+
+    # Solves an n x n board by placing the top row and then the left column of the
+    # unsolved block, shrinking it from k x k to (k-1) x (k-1) until FINISH x FINISH
+    # is left for A*. The blank goal must lie in that last block.
+    def __init__(self, tree):
+        n = self.n = tree.n
+        self.tree = tree
+        self.board = tree.tiles(tree.root.state)
+        self.goal = tree.tiles(tree.goal_state)
+        self.where = SearchTree.cells(self.board)
+        self.zero = tree.root.zero
+        self.locked = [False] * (n * n)
+        self.moves = []            # blank move codes, in order
+
+        gx, gy = tree.goal_pos[0]
+        if min(gx, gy) < n - FINISH:
+            raise ValueError("Constructive solver needs the blank goal in the bottom-right 3x3")
+
+    # Slide the tile at an adjacent cell into the blank
+    def step(self, target):
+        zero, board = self.zero, self.board
+        self.moves.append(self.tree._move_code(zero, target))
+        tile = board[target]
+        board[zero], board[target] = tile, 0
+        self.where[tile], self.where[0] = zero, target
+        self.zero = target
+
+    # Shortest route (cells after start) through unlocked cells outside avoid, or None
+    def route(self, start, goal, avoid=()):
+        neighbors = Node.neighbors(self.n)
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            if cell == goal:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = previous[cell]
+                return path[::-1]
+            for _, nxt in neighbors[cell]:
+                if nxt not in previous and not self.locked[nxt] and nxt not in avoid:
+                    previous[nxt] = cell
+                    queue.append(nxt)
+        return None
+
+    def blank_to(self, cell, avoid=()):
+        path = self.route(self.zero, cell, avoid)
+        if path is None:
+            raise RuntimeError(f"Blank cannot reach cell {cell}")
+        for target in path:
+            self.step(target)
+
+    # Walk a tile to cell one step at a time, bringing the blank in front of it
+    def tile_to(self, tile, cell):
+        while self.where[tile] != cell:
+            position = self.where[tile]
+            self.blank_to(self.route(position, cell)[0], avoid=(position,))
+            self.step(position)
+
+    # Put the last two tiles of a row or column in place: both are brought into the 3x3
+    # corner window (the first one held in its middle row while the second moves), then
+    # a breadth-first search over the positions of the two tiles and the blank inside
+    # the window finishes them without disturbing locked tiles
+    def place_pair(self, first, second, stage_first, stage_second, window):
+        a, b = self.goal[first], self.goal[second]
+        if self.where[a] != first or self.where[b] != second:
+            self.tile_to(a, stage_first)
+            self.locked[stage_first] = True
+            self.tile_to(b, stage_second)
+            self.locked[stage_first] = False
+
+            cells = set(window)
+            if self.zero not in cells:
+                entry = next(cell for cell in window
+                             if cell not in (self.where[a], self.where[b]))
+                self.blank_to(entry, avoid=(self.where[a], self.where[b]))
+
+            start = (self.where[a], self.where[b], self.zero)
+            previous = {start: None}
+            queue = deque([start])
+            while True:
+                if not queue:
+                    raise RuntimeError("Pair cannot be placed inside the window")
+                state = queue.popleft()
+                pa, pb, zero = state
+                if pa == first and pb == second:
+                    break
+                for _, nxt in Node.neighbors(self.n)[zero]:
+                    if nxt in cells:
+                        child = (zero if nxt == pa else pa, zero if nxt == pb else pb, nxt)
+                        if child not in previous:
+                            previous[child] = state
+                            queue.append(child)
+
+            blanks = []
+            while previous[state] is not None:
+                blanks.append(state[2])
+                state = previous[state]
+            for cell in reversed(blanks):
+                self.step(cell)
+
+        self.locked[first] = self.locked[second] = True
+
+    # Place row r and then column r of the block whose top-left corner is (r, r)
+    def reduce(self, r):
+        n = self.n
+        for c in range(r, n - 2):
+            self.tile_to(self.goal[r * n + c], r * n + c)
+            self.locked[r * n + c] = True
+        window = [x * n + y for x in range(r, r + 3) for y in range(n - 3, n)
+                  if not self.locked[x * n + y]]
+        self.place_pair(r * n + n - 2, r * n + n - 1,
+                        (r + 2) * n + n - 2, (r + 1) * n + n - 1, window)
+
+        for x in range(r + 1, n - 2):
+            self.tile_to(self.goal[x * n + r], x * n + r)
+            self.locked[x * n + r] = True
+        window = [x * n + y for x in range(n - 3, n) for y in range(r, r + 3)
+                  if not self.locked[x * n + y]]
+        self.place_pair((n - 2) * n + r, (n - 1) * n + r,
+                        (n - 2) * n + r + 2, (n - 1) * n + r + 1, window)
+
+    # Optimal A* on the remaining bottom-right block, relabelled as a 3x3 puzzle
+    def finish(self):
+        n = self.n
+        block = [x * n + y for x in range(n - FINISH, n) for y in range(n - FINISH, n)]
+        labels = {tile: label for label, tile in enumerate(sorted(self.goal[c] for c in block))}
+
+        def rows(tiles):
+            values = [labels[tiles[c]] for c in block]
+            return [values[i * FINISH:(i + 1) * FINISH] for i in range(FINISH)]
+
+        tree = SearchTree(rows(self.board), rows(self.goal))
+        path, cost, processed_nodes, solved = tree.A_star()
+        for board, (_, (x, y)) in path[1:]:
+            self.step((n - FINISH + x) * n + n - FINISH + y)
+        return processed_nodes
+
+    def solve(self):
+        for r in range(self.n - FINISH):
+            self.reduce(r)
+        return self.finish()
+
+
+# Drop move pairs that undo each other, then any loop back to an earlier state
+def shorten(tree, moves):
+    stack = []
+    for move in moves:
+        if stack and stack[-1] == INVERSE[move]:
+            stack.pop()
+        else:
+            stack.append(move)
+
+    node = tree.root
+    kept = [node]
+    seen = {node.state: 0}
+    for move in stack:
+        target = node.zero + (-tree.n, tree.n, -1, 1)[move]
+        node = kept[-1].apply(move, target, tree.bits)
+        index = seen.get(node.state)
+        if index is not None:
+            # Back at an earlier state: cut the loop
+            for dropped in kept[index + 1:]:
+                del seen[dropped.state]
+            del kept[index + 1:]
+            node = kept[-1]
+            continue
+        seen[node.state] = len(kept)
+        kept.append(node)
+    return node
+
+
+# Fast suboptimal solver for any n >= 3: rows and columns are placed one at a time,
+# and the last 3x3 block is solved optimally. Returns the A_star result tuple, or None
+# for an unsolvable board; shorten_path removes backtracks and loops from the move sequence.
+def constructive_solve(tree, time_limit=None, shorten_path=True):
+    if not tree.solvable():
+        return None
+    start_time = time.time()
+    solver = ConstructiveSolver(tree)
+    processed_nodes = solver.solve()
+
+    if time_limit is not None and (time.time() - start_time) >= time_limit:
+        print("\nTime limit exceeded")
+        return False
+
+    if shorten_path:
+        node = shorten(tree, solver.moves)
+    else:
+        node = tree.root
+        for move in solver.moves:
+            node = node.apply(move, node.zero + (-tree.n, tree.n, -1, 1)[move], tree.bits)
+
+    if not tree.goal_test(node.state):
+        raise RuntimeError("Constructive solver did not reach the goal")
+    return tree.solution(node), node.g, processed_nodes + len(solver.moves), True
@@ -0,0 +1,184 @@
+import heapq
+import multiprocessing as mp
+import queue
+import time
+
+from Node import Node, SearchTree
+
+BATCH = 64          # expansions between flushes of outgoing children
+NO_SOLUTION = 2 ** 31 - 1
+
+# Per-worker slots in the shared stats array
+SENT, RECEIVED, IDLE, GENERATED = range(4)
+
+
+# Worker that owns a state (Python int hashes are deterministic across processes)
+def owner(state, workers):
+    return hash(state) % workers
+
+
+# One HDA* worker: owns the states hashed to it, with its own open list and best_g
+def _worker(index, workers, initial_state, goal_state, heuristic_name,
+            inboxes, replies, incumbent, stats, stop):
+    tree = SearchTree(initial_state, goal_state, heuristic_name)
+    inbox = inboxes[index]
+    base = index * 4
+
+    # Unread batches must not keep this process alive after stop
+    for channel in inboxes + [replies]:
+        channel.cancel_join_thread()
+
+    frontier = []              # (f, seq, state)
+    best_g = {}                # state -> (g, h, parent state, move, zero)
+    outgoing = [[] for _ in range(workers)]
+    seq = 0
+
+    # Accept children (g, h, state, zero, parent, move) owned by this worker
+    def merge(batch):
+        nonlocal seq
+        for g, h, state, zero, parent, move in batch:
+            old = best_g.get(state)
+            if old is not None and g >= old[0]:
+                continue
+            best_g[state] = (g, h, parent, move, zero)
+            if state == tree.goal_state:
+                with incumbent.get_lock():
+                    if g < incumbent.value:
+                        incumbent.value = g
+                continue
+            heapq.heappush(frontier, (g + h, seq, state))
+            seq += 1
+
+    def idle():
+        return not frontier or frontier[0][0] >= incumbent.value
+
+    def handle(message):
+        kind = message[0]
+        if kind == "nodes":
+            merge(message[1])
+            # Announce work before acknowledging the batch, so quiescence is never seen early
+            if not idle():
+                stats[base + IDLE] = 0
+            stats[base + RECEIVED] += 1
+        elif kind == "parent":
+            g, h, parent, move, zero = best_g[message[1]]
+            replies.put((message[1], g, parent, move, zero))
+
+    if owner(tree.root.state, workers) == index:
+        root = tree.root
+        merge([(0, tree.heuristic(root.state), root.state, root.zero, None, None)])
+
+    while not stop.is_set():
+        while True:
+            try:
+                handle(inbox.get_nowait())
+            except queue.Empty:
+                break
+
+        # Expand a slice of the open list
+        for _ in range(BATCH):
+            if idle():
+                break
+            f, _, state = heapq.heappop(frontier)
+            g, h, parent, move, zero = best_g[state]
+            if f != g + h:
+                continue   # outdated entry
+
+            node = Node(state, g, None, move, zero)
+            node.h = h
+            for child in node.expand(tree.n, tree.bits):
+                child.h = tree.update_heuristic(node, child)
+                if child.g + child.h >= incumbent.value:
+                    continue
+                stats[base + GENERATED] += 1
+                entry = (child.g, child.h, child.state, child.zero, state, child.move)
+                dest = owner(child.state, workers)
+                if dest == index:
+                    merge([entry])
+                else:
+                    outgoing[dest].append(entry)
+
+        # Count batches as sent before they can be received
+        for dest in range(workers):
+            if outgoing[dest]:
+                stats[base + SENT] += 1
+                inboxes[dest].put(("nodes", outgoing[dest]))
+                outgoing[dest] = []
+
+        if idle():
+            stats[base + IDLE] = 1
+            try:
+                handle(inbox.get(timeout=0.005))
+            except queue.Empty:
+                pass
+        else:
+            stats[base + IDLE] = 0
+
+
+# Hash-distributed parallel A*: states are partitioned across worker processes by hash.
+# Terminates once every worker is idle (open list empty or min f >= incumbent) and no
+# child batch is in flight, so the incumbent is optimal. Returns the A_star result tuple.
+def hda_star(tree, time_limit=None, workers=4):
+    start_time = time.time()
+
+    if tree.goal_test(tree.root.state):
+        return tree.solution(tree.root), 0, 1, True
+
+    initial_state = tree.decode(tree.root.state)
+    goal_state = tree.decode(tree.goal_state)
+
+    inboxes = [mp.Queue() for _ in range(workers)]
+    replies = mp.Queue()
+    incumbent = mp.Value("i", NO_SOLUTION)
+    stats = mp.Array("q", workers * 4, lock=False)
+    stop = mp.Event()
+
+    processes = [mp.Process(target=_worker,
+                            args=(i, workers, initial_state, goal_state, tree.heuristic_name,
+                                  inboxes, replies, incumbent, stats, stop), daemon=True)
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+
+    try:
+        previous = None
+        while True:
+            # Stop if time limit exceeded
+            if time_limit is not None and (time.time() - start_time) >= time_limit:
+                print("\nTime limit exceeded")
+                return False
+
+            time.sleep(0.002)
+            snapshot = tuple(stats)
+            quiet = (all(snapshot[i * 4 + IDLE] for i in range(workers))
+                     and sum(snapshot[SENT::4]) == sum(snapshot[RECEIVED::4]))
+            # Two identical quiet snapshots: nothing moved in between
+            if quiet and snapshot == previous:
+                break
+            previous = snapshot if quiet else None
+
+        if incumbent.value == NO_SOLUTION:
+            return None
+
+        # Walk parent links back from the goal, asking each state's owner
+        chain = []
+        state = tree.goal_state
+        while state is not None:
+            inboxes[owner(state, workers)].put(("parent", state))
+            state, g, parent, move, zero = replies.get()
+            chain.append((state, g, move, zero))
+            state = parent
+
+        node = None
+        for state, g, move, zero in reversed(chain):
+            node = Node(state, g, node, move, zero)
+
+        processed_nodes = 1 + sum(snapshot[GENERATED::4])
+        return tree.solution(node), node.g, processed_nodes, True
+
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
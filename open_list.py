@@ -0,0 +1,90 @@
+import heapq
+
+
+HANDLE_BITS = 32   # low bits of a heap key hold the node handle
+
+
+class HeapOpenList:
+
+    # Binary heap of int keys f << 32 | handle; equal f pops in insertion order
+    def __init__(self):
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, f, g, handle):
+        heapq.heappush(self.heap, (f << HANDLE_BITS) | handle)
+
+    def push_many(self, fs, gs, handles):
+        heap = self.heap
+        for f, handle in zip(fs, handles):
+            heapq.heappush(heap, (f << HANDLE_BITS) | handle)
+
+    def pop(self):
+        return heapq.heappop(self.heap) & ((1 << HANDLE_BITS) - 1)
+
+    # (f, handle) pairs in heap order: pushing them back rebuilds the same heap
+    def entries(self):
+        mask = (1 << HANDLE_BITS) - 1
+        return [(key >> HANDLE_BITS, key & mask) for key in self.heap]
+
+
+class BucketOpenList:
+
+    # Array of buckets indexed by f, each split into LIFO stacks indexed by g.
+    # Pops take the lowest f, then the highest g (deepest node), newest first.
+    def __init__(self):
+        self.buckets = []      # buckets[f][g] -> stack of handles
+        self.min_f = 0         # no non-empty bucket below this f
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, f, g, handle):
+        buckets = self.buckets
+        while len(buckets) <= f:
+            buckets.append([])
+        bucket = buckets[f]
+        while len(bucket) <= g:
+            bucket.append([])
+        bucket[g].append(handle)
+
+        if f < self.min_f:
+            self.min_f = f
+        self.size += 1
+
+    def push_many(self, fs, gs, handles):
+        for f, g, handle in zip(fs, gs, handles):
+            self.push(f, g, handle)
+
+    def pop(self):
+        if self.size == 0:
+            raise IndexError("pop from empty open list")
+
+        buckets = self.buckets
+        while True:
+            bucket = buckets[self.min_f]
+            # Drop exhausted g stacks from the top of the bucket
+            while bucket and not bucket[-1]:
+                bucket.pop()
+            if bucket:
+                break
+            self.min_f += 1
+
+        self.size -= 1
+        return bucket[-1].pop()
+
+    # (f, handle) pairs bottom of each stack first: pushing them back (with their g)
+    # rebuilds the same stacks
+    def entries(self):
+        return [(f, handle) for f, bucket in enumerate(self.buckets)
+                for stack in bucket for handle in stack]
+
+
+# Open list implementations selectable by name
+OPEN_LISTS = {
+    "heap": HeapOpenList,
+    "buckets": BucketOpenList,
+}
@@ -0,0 +1,219 @@
+import multiprocessing as mp
+import queue
+import time
+
+from Node import INVERSE, Node, SearchTree
+
+SPLIT_FACTOR = 16       # subproblems per worker wanted from the split
+MAX_SPLIT_DEPTH = 12
+CHECK_EVERY = 1024      # nodes between checks of the stop event
+NO_BOUND = 2 ** 31 - 1
+
+
+# Expand the root to a fixed depth (no move undoing the previous one). Returns the
+# subproblems as (moves, f of every node on the way), the moves of the shortest goal
+# met on the way (None if none), and the number of nodes generated.
+def split(tree, depth):
+    board = tree.tiles(tree.root.state)
+    goal = tree.tiles(tree.goal_state)
+    neighbors = Node.neighbors(tree.n)
+    subproblems = []
+    moves, fs = [], []
+    best = None
+    generated = 0
+
+    def visit(g, h, zero, last):
+        nonlocal best, generated
+        fs.append(g + h)
+        if h == 0 and board == goal:
+            if best is None or g < len(best):
+                best = list(moves)
+        elif g == depth:
+            subproblems.append((tuple(moves), tuple(fs)))
+        else:
+            for move, target in neighbors[zero]:
+                if last is not None and move == INVERSE[last]:
+                    continue
+                child_h = tree._apply_move(board, zero, target, h)
+                generated += 1
+                moves.append(move)
+                visit(g + 1, child_h, target, move)
+                moves.pop()
+                board[target], board[zero] = board[zero], 0
+        fs.pop()
+
+    visit(0, tree.heuristic(tree.root.state), tree.root.zero, None)
+    return subproblems, best, generated
+
+
+# Smallest split depth giving at least SPLIT_FACTOR subproblems per worker
+def choose_split(tree, workers):
+    for depth in range(1, MAX_SPLIT_DEPTH + 1):
+        subproblems, best, generated = split(tree, depth)
+        if best is not None or len(subproblems) >= workers * SPLIT_FACTOR:
+            break
+    return depth, subproblems, best, generated
+
+
+# One worker: for every f bound it receives, take subproblems from the shared counter
+# until none are left and search each one depth-first up to the bound
+def _worker(initial_state, goal_state, heuristic_name, subproblems,
+            commands, results, next_task, next_bound, stop):
+    tree = SearchTree(initial_state, goal_state, heuristic_name)
+    goal = tree.tiles(tree.goal_state)
+    neighbors = Node.neighbors(tree.n)
+
+    # Board, blank, h and last move at the end of every subproblem's moves
+    starts = []
+    root_h = tree.heuristic(tree.root.state)
+    for moves, fs in subproblems:
+        board, zero, h = tree.tiles(tree.root.state), tree.root.zero, root_h
+        for move in moves:
+            target = zero + (-tree.n, tree.n, -1, 1)[move]
+            h = tree._apply_move(board, zero, target, h)
+            zero = target
+        starts.append((board, zero, h, moves[-1] if moves else None))
+
+    while True:
+        bound = commands.get()
+        if bound is None:
+            return
+        processed = 0
+        path = []
+
+        # Depth-first search bounded by f; returns True on the goal or when stopped
+        def search(g, h, zero, last):
+            nonlocal processed, local_min
+            f = g + h
+            if f > bound:
+                local_min = min(local_min, f)
+                return False
+            if h == 0 and board == goal:
+                return True
+            if processed % CHECK_EVERY == 0 and stop.is_set():
+                return True
+
+            for move, target in neighbors[zero]:
+                if last is not None and move == INVERSE[last]:
+                    continue
+                child_h = tree._apply_move(board, zero, target, h)
+                processed += 1
+                path.append(move)
+                if search(g + 1, child_h, target, move):
+                    return True
+                path.pop()
+                board[target], board[zero] = board[zero], 0
+            return False
+
+        while not stop.is_set():
+            with next_task.get_lock():
+                index = next_task.value
+                next_task.value += 1
+            if index >= len(starts):
+                break
+
+            local_min = NO_BOUND
+            moves, fs = subproblems[index]
+            # Pruned above the split depth, as sequential IDA* would
+            pruned = next((f for f in fs if f > bound), None)
+            if pruned is not None:
+                local_min = pruned
+            else:
+                start, zero, h, last = starts[index]
+                board = list(start)
+                if search(len(moves), h, zero, last) and not stop.is_set():
+                    results.put(("found", index, list(path), processed))
+                    break
+
+            with next_bound.get_lock():
+                if local_min < next_bound.value:
+                    next_bound.value = local_min
+        results.put(("idle", processed))
+
+
+# Parallel IDA*: the root is split into subproblems at a shallow depth, and every f
+# bound is searched by worker processes that take subproblems one at a time from a
+# shared counter (so fast workers take more). The smallest f above the bound is shared
+# for the next iteration. Any goal found under a bound costs exactly that bound (no
+# smaller one was found before), so the first one stops all workers and is optimal.
+# Returns the A_star result tuple, or None at once for an unsolvable board.
+def parallel_ida_star(tree, time_limit=None, workers=4, split_depth=None):
+    if not tree.solvable():
+        return None
+    start_time = time.time()
+
+    if tree.goal_test(tree.root.state):
+        return tree.solution(tree.root), 0, 1, True
+
+    if split_depth is None:
+        split_depth, subproblems, best, processed_nodes = choose_split(tree, workers)
+    else:
+        subproblems, best, processed_nodes = split(tree, split_depth)
+    processed_nodes += 1
+
+    # Every path up to the split depth was tried, so a goal met there is optimal
+    if best is not None:
+        return _result(tree, best, processed_nodes)
+    if not subproblems:
+        return None
+
+    commands = [mp.Queue() for _ in range(workers)]
+    results = mp.Queue()
+    next_task = mp.Value("i", 0)
+    next_bound = mp.Value("i", NO_BOUND)
+    stop = mp.Event()
+
+    processes = [mp.Process(target=_worker,
+                            args=(tree.decode(tree.root.state), tree.decode(tree.goal_state),
+                                  tree.heuristic_name, subproblems, commands[i], results,
+                                  next_task, next_bound, stop), daemon=True)
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+
+    try:
+        bound = tree.heuristic(tree.root.state)
+        while True:
+            next_task.value = 0
+            next_bound.value = NO_BOUND
+            for channel in commands:
+                channel.put(bound)
+
+            idle = 0
+            while idle < workers:
+                # Stop if time limit exceeded
+                if time_limit is not None and (time.time() - start_time) >= time_limit:
+                    print("\nTime limit exceeded")
+                    return False
+                try:
+                    message = results.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                if message[0] == "found":
+                    stop.set()
+                    _, index, moves, processed = message
+                    moves = list(subproblems[index][0]) + moves
+                    return _result(tree, moves, processed_nodes + processed)
+                idle += 1
+                processed_nodes += message[1]
+
+            # Whole reachable space exhausted
+            if next_bound.value == NO_BOUND:
+                return None
+            bound = next_bound.value
+
+    finally:
+        stop.set()
+        for channel in commands:
+            channel.put(None)
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+
+def _result(tree, moves, processed_nodes):
+    node = tree.root
+    for move in moves:
+        node = node.apply(move, node.zero + (-tree.n, tree.n, -1, 1)[move], tree.bits)
+    return tree.solution(node), node.g, processed_nodes, True
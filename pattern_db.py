@@ -0,0 +1,242 @@
+import mmap
+import os
+import struct
+
+MAGIC = b"NPDB"
+VERSION = 1
+UNSEEN = 255   # table entry not reached (also caps stored distances)
+
+# Default disjoint partitions of tile values per puzzle size
+PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 4, 5, 6), (7, 8, 9, 10, 11, 12), (13, 14, 15)),
+    # 6-tile 5x5 tables have 127.5M entries each, too many for a Python BFS
+    5: ((1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15),
+        (16, 17, 18, 19, 20), (21, 22, 23, 24)),
+}
+
+
+# Default table file for an n x n puzzle, next to this module
+def default_path(n):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"pdb_{n}x{n}.pdb")
+
+
+# Number of ways to place k distinct tiles on n_cells cells
+def table_size(k, n_cells):
+    size = 1
+    for i in range(k):
+        size *= n_cells - i
+    return size
+
+
+# Index of distinct cell positions (partial permutation rank)
+def rank(positions, n_cells):
+    index = 0
+    for i, cell in enumerate(positions):
+        smaller = 0
+        for j in range(i):
+            if positions[j] < cell:
+                smaller += 1
+        index = index * (n_cells - i) + cell - smaller
+    return index
+
+
+# Inverse of rank: cell positions for a table index
+def unrank(index, k, n_cells):
+    digits = []
+    for i in range(k - 1, -1, -1):
+        radix = n_cells - i
+        digits.append(index % radix)
+        index //= radix
+    digits.reverse()
+
+    used = [False] * n_cells
+    positions = []
+    for digit in digits:
+        # digit-th cell not taken by an earlier tile
+        for cell in range(n_cells):
+            if not used[cell]:
+                if digit == 0:
+                    break
+                digit -= 1
+        used[cell] = True
+        positions.append(cell)
+    return positions
+
+
+# Blank neighbours of every cell
+def _neighbors(n):
+    table = []
+    for x in range(n):
+        for y in range(n):
+            cells = [(x-1, y), (x+1, y), (x, y-1), (x, y+1)]
+            table.append([nx * n + ny for nx, ny in cells if 0 <= nx < n and 0 <= ny < n])
+    return table
+
+
+# Backward BFS from the goal: fewest pattern-tile moves for every placement of the pattern
+def build_table(goal_state, pattern):
+    n = len(goal_state)
+    n_cells = n * n
+    k = len(pattern)
+    neighbors = _neighbors(n)
+
+    goal_cell = {}
+    for i in range(n):
+        for j in range(n):
+            goal_cell[goal_state[i][j]] = i * n + j
+
+    table = bytearray([UNSEEN]) * table_size(k, n_cells)
+    # One bit per (pattern index, blank region), the region named by its smallest cell:
+    # blank moves over other tiles are free, so all blank cells of a region are one state
+    seen = bytearray((len(table) * n_cells + 7) // 8)
+
+    # Cells the blank reaches without moving a pattern tile
+    def region(positions, blank):
+        blocked = bytearray(n_cells)
+        for cell in positions:
+            blocked[cell] = 1
+        blocked[blank] = 1
+        cells = [blank]
+        for cell in cells:
+            for neighbor in neighbors[cell]:
+                if not blocked[neighbor]:
+                    blocked[neighbor] = 1
+                    cells.append(neighbor)
+        return cells
+
+    # Queue a state unless it was reached before
+    def push(queue, index, positions, blank):
+        key = index * n_cells + min(region(positions, blank))
+        if not seen[key >> 3] & (1 << (key & 7)):
+            seen[key >> 3] |= 1 << (key & 7)
+            queue.append(key)
+
+    frontier = []
+    start = [goal_cell[tile] for tile in pattern]
+    push(frontier, rank(start, n_cells), start, goal_cell[0])
+    cost = 0
+
+    # BFS by layers over blank regions; every step moves one pattern tile
+    while frontier:
+        next_frontier = []
+        for key in frontier:
+            index, blank = divmod(key, n_cells)
+            if table[index] == UNSEEN:
+                table[index] = min(cost, UNSEEN - 1)
+
+            positions = unrank(index, k, n_cells)
+            slot = dict(zip(positions, range(k)))
+            for cell in region(positions, blank):
+                for neighbor in neighbors[cell]:
+                    if neighbor in slot:
+                        moved = list(positions)
+                        moved[slot[neighbor]] = cell
+                        push(next_frontier, rank(moved, n_cells), moved, neighbor)
+
+        frontier = next_frontier
+        cost += 1
+
+    return table
+
+
+class PatternDatabase:
+
+    def __init__(self, n, goal, patterns, tables):
+
+        self.n = n
+        self.goal = tuple(goal)            # goal tiles in row-major order
+        self.patterns = tuple(tuple(p) for p in patterns)
+        self.tables = tables               # one byte per placement, per pattern
+
+        # Pattern owning each tile (None for tiles outside every pattern)
+        self.pattern_of = [None] * (n * n)
+        for i, pattern in enumerate(self.patterns):
+            for tile in pattern:
+                self.pattern_of[tile] = i
+
+    # Build all tables of a disjoint partition for the given goal
+    @classmethod
+    def build(cls, goal_state, partition=None):
+        n = len(goal_state)
+        if partition is None:
+            partition = PARTITIONS[n]
+
+        seen = set()
+        for pattern in partition:
+            if 0 in pattern or seen.intersection(pattern):
+                raise ValueError("Patterns must be disjoint and must not contain 0")
+            seen.update(pattern)
+
+        goal = [tile for row in goal_state for tile in row]
+        tables = [build_table(goal_state, pattern) for pattern in partition]
+        return cls(n, goal, partition, tables)
+
+    # Write header, goal, patterns and tables to a binary file
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(struct.pack("<4sBBB", MAGIC, VERSION, self.n, len(self.patterns)))
+            file.write(bytes(self.goal))
+            for pattern in self.patterns:
+                file.write(bytes([len(pattern)]))
+                file.write(bytes(pattern))
+            for table in self.tables:
+                file.write(table)
+
+    # Map a table file read-only; entries are paged in on demand
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n, count = struct.unpack_from("<4sBBB", data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a pattern database file")
+
+        offset = struct.calcsize("<4sBBB")
+        goal = data[offset:offset + n * n]
+        offset += n * n
+
+        patterns = []
+        for _ in range(count):
+            k = data[offset]
+            patterns.append(tuple(data[offset + 1:offset + 1 + k]))
+            offset += 1 + k
+
+        tables = []
+        view = memoryview(data)
+        for pattern in patterns:
+            size = table_size(len(pattern), n * n)
+            tables.append(view[offset:offset + size])
+            offset += size
+
+        if offset != len(data):
+            raise ValueError(f"{path} has an unexpected size")
+
+        return cls(n, goal, patterns, tables)
+
+    # Value of one pattern; where[tile] is the tile's cell index
+    def pattern_value(self, i, where):
+        positions = [where[tile] for tile in self.patterns[i]]
+        return self.tables[i][rank(positions, self.n * self.n)]
+
+    # Additive heuristic over all patterns
+    def value(self, where):
+        return sum(self.pattern_value(i, where) for i in range(len(self.patterns)))
+
+
+def main():
+    from run_test import generate_goal_state
+
+    n = int(input(f"Enter n ({min(PARTITIONS)}-{max(PARTITIONS)}): "))
+    if n not in PARTITIONS:
+        raise ValueError(f"No default partition for n={n}")
+
+    path = default_path(n)
+    print(f"Building {'-'.join(str(len(p)) for p in PARTITIONS[n])} pattern database...")
+    PatternDatabase.build(generate_goal_state(n)).save(path)
+    print(f"Saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import mmap
+import os
+import struct
+from collections import deque
+
+from pattern_db import rank, table_size
+
+MAGIC = b"NPPD"
+VERSION = 1
+N = 3              # only the 3x3 state space is small enough to store whole
+MODULUS = 15       # distances are stored mod 15 in one nibble
+UNSEEN = 15        # nibble of permutations not reachable from the goal
+
+
+# Default table file for the 3x3 puzzle, next to this module
+def default_perfect_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"perfect_{N}x{N}.pdb")
+
+
+def _nibble(table, index):
+    return (table[index >> 1] >> ((index & 1) << 2)) & 0xF
+
+
+# Blank moves of every cell as (move code, target cell), in Node.neighbors order
+def _moves(n):
+    table = []
+    for x in range(n):
+        for y in range(n):
+            moves = [(0, x - 1, y), (1, x + 1, y), (2, x, y - 1), (3, x, y + 1)]
+            table.append(tuple((move, nx * n + ny) for move, nx, ny in moves
+                               if 0 <= nx < n and 0 <= ny < n))
+    return table
+
+
+# Backward BFS from the goal over whole boards; entry rank(board) holds the exact
+# distance mod MODULUS, two entries per byte (low nibble first)
+def build_distances(goal_state):
+    n = len(goal_state)
+    cells = n * n
+    moves = _moves(n)
+
+    table = bytearray([UNSEEN << 4 | UNSEEN]) * ((table_size(cells, cells) + 1) // 2)
+
+    def store(index, distance):
+        shift = (index & 1) << 2
+        byte = table[index >> 1] & ~(0xF << shift)
+        table[index >> 1] = byte | (distance % MODULUS) << shift
+
+    goal = [tile for row in goal_state for tile in row]
+    store(rank(goal, cells), 0)
+    queue = deque([(goal, goal.index(0), 0)])
+    while queue:
+        board, zero, distance = queue.popleft()
+        for _, target in moves[zero]:
+            child = list(board)
+            child[zero], child[target] = child[target], 0
+            index = rank(child, cells)
+            if _nibble(table, index) == UNSEEN:
+                store(index, distance + 1)
+                queue.append((child, target, distance + 1))
+    return table
+
+
+class PerfectDatabase:
+
+    # Exact distances of every 3x3 board to one goal. Only distances mod 15 are stored:
+    # every move changes the distance by exactly one, so the neighbour holding the
+    # stored value minus one is a step toward the goal, and walking those steps both
+    # finds an optimal path and counts the true distance.
+    def __init__(self, goal, table):
+        self.n = N
+        self.goal = tuple(goal)             # goal tiles in row-major order
+        self.table = table
+        self.moves = _moves(N)
+
+    @classmethod
+    def build(cls, goal_state):
+        if len(goal_state) != N:
+            raise ValueError(f"Perfect tables exist only for {N}x{N} puzzles")
+        return cls([tile for row in goal_state for tile in row], build_distances(goal_state))
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(struct.pack("<4sBB", MAGIC, VERSION, self.n))
+            file.write(bytes(self.goal))
+            file.write(self.table)
+
+    # Map a table file read-only
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n = struct.unpack_from("<4sBB", data, 0)
+        if magic != MAGIC or version != VERSION or n != N:
+            raise ValueError(f"{path} is not a perfect distance table")
+
+        offset = struct.calcsize("<4sBB")
+        goal = data[offset:offset + n * n]
+        offset += n * n
+        table = memoryview(data)[offset:]
+        if len(table) != (table_size(n * n, n * n) + 1) // 2:
+            raise ValueError(f"{path} has an unexpected size")
+        return cls(goal, table)
+
+    # Blank move codes of an optimal path from a board (flat tile list) to the goal,
+    # or None if the board cannot reach it
+    def path(self, tiles):
+        cells = self.n * self.n
+        board = list(tiles)
+        stored = _nibble(self.table, rank(board, cells))
+        if stored == UNSEEN:
+            return None
+
+        path = []
+        goal = list(self.goal)
+        zero = board.index(0)
+        while board != goal:
+            wanted = (stored - 1) % MODULUS
+            for move, target in self.moves[zero]:
+                board[zero], board[target] = board[target], 0
+                value = _nibble(self.table, rank(board, cells))
+                if value == wanted:
+                    path.append(move)
+                    zero, stored = target, value
+                    break
+                board[target], board[zero] = board[zero], 0
+        return path
+
+    # Exact number of moves from a board to the goal, or None if unreachable
+    def distance(self, tiles):
+        path = self.path(tiles)
+        return None if path is None else len(path)
+
+
+def main():
+    from run_test import generate_goal_state
+
+    path = default_perfect_path()
+    print(f"Building the {N}x{N} perfect distance table...")
+    PerfectDatabase.build(generate_goal_state(N)).save(path)
+    print(f"Saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
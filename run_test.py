@@ -1,8 +1,35 @@
 from time import time
 from Node import SearchTree
+from constructive import constructive_solve
+from hda import hda_star
+from parallel_ida import parallel_ida_star
+
+try:
+    from vectorized import batched_a_star
+except ImportError:   # NumPy not installed
+    batched_a_star = None
 
 MIN_N = 3   # minimum puzzle size
-MAX_N = 6   # maximum puzzle size
+MAX_N = 10  # maximum puzzle size (beyond 5x5 only the constructive solver is practical)
+
+# Search entry points by key; each is called as search(tree, time_limit)
+SEARCHES = {
+    "A_star": SearchTree.A_star,
+    "EPEA_star": SearchTree.EPEA_star,
+    "IDA_star": SearchTree.IDA_star,
+    "HDA_star": hda_star,
+    "parallel_IDA_star": parallel_ida_star,
+    "bidirectional": SearchTree.bidirectional,
+    "SMA_star": SearchTree.SMA_star,
+    "ARA_star": SearchTree.ARA_star,
+    "constructive": constructive_solve,
+}
+if batched_a_star is not None:
+    SEARCHES["batched_A_star"] = batched_a_star
+
+# Heuristic keys accepted by SearchTree
+HEURISTICS = ("manhattan_linear_conflict", "manhattan", "misplaced_tiles", "gasching",
+              "pattern_database", "perfect")
 
 
 # Generate goal state (1..n²-1, 0 at the end)
@@ -87,24 +114,66 @@ def choose_algorithm():
     print("2. Manhattan Distance")
     print("3. Misplaced Tiles")
     print("4. Gasching Distance")
+    print("5. Pattern Database")
+    print("6. Perfect (3x3 distance table)")
 
-    choice = int(input("Select (1-4): "))
+    choice = int(input("Select (1-6): "))
 
     options = {
         1: ("manhattan_linear_conflict", "Manhattan + Linear Conflict"),
         2: ("manhattan", "Manhattan Distance"),
         3: ("misplaced_tiles", "Misplaced Tiles"),
         4: ("gasching", "Gasching Distance"),
+        5: ("pattern_database", "Pattern Database"),
+        6: ("perfect", "Perfect"),
+    }
+
+    if choice not in options:
+        raise ValueError("Algorithm must be between 1 and 6")
+
+    return options[choice]
+
+
+# Let user choose search algorithm
+def choose_search():
+    print("Choose search:")
+    print("1. A*")
+    print("2. IDA*")
+    print("3. HDA* (parallel A*)")
+    print("4. Bidirectional MM")
+    print("5. SMA* (memory-bounded)")
+    print("6. Batched A* (NumPy)")
+    print("7. Anytime ARA* (best path by the time limit)")
+    print("8. Constructive (fast, suboptimal, any size)")
+    print("9. EPEA* (partial expansion A*)")
+    print("10. Parallel IDA* (tree splitting)")
+
+    choice = int(input("Select (1-10): "))
+
+    options = {
+        1: ("A_star", "A*"),
+        2: ("IDA_star", "IDA*"),
+        3: ("HDA_star", "HDA*"),
+        4: ("bidirectional", "Bidirectional MM"),
+        5: ("SMA_star", "SMA*"),
+        6: ("batched_A_star", "Batched A*"),
+        7: ("ARA_star", "ARA*"),
+        8: ("constructive", "Constructive"),
+        9: ("EPEA_star", "EPEA*"),
+        10: ("parallel_IDA_star", "Parallel IDA*"),
     }
 
     if choice not in options:
-        raise ValueError("Algorithm must be between 1 and 4")
+        raise ValueError("Search must be between 1 and 10")
+    if options[choice][0] not in SEARCHES:
+        raise ValueError("Batched A* needs NumPy")
 
     return options[choice]
 
 
-# Run A* and print results
-def run_test(initial_state, goal_state, heuristic_key, heuristic_label, time_limit=None):
+# Run search and print results
+def run_test(initial_state, goal_state, heuristic_key, heuristic_label, time_limit=None,
+             search_key="A_star", search_label="A*", max_bytes=None):
 
     # Check solvability before running search
     if not is_solvable(initial_state, goal_state):
@@ -112,10 +181,12 @@ def run_test(initial_state, goal_state, heuristic_key, heuristic_label, time_lim
         return
 
     start_time = time()
-    result = SearchTree(initial_state, goal_state, heuristic_key).A_star(time_limit)
+    tree = SearchTree(initial_state, goal_state, heuristic_key, max_bytes=max_bytes)
+    result = SEARCHES[search_key](tree, time_limit)
     elapsed = time() - start_time
 
-    print(f"\nHeuristic: {heuristic_label}")
+    print(f"\nSearch: {search_label}")
+    print(f"Heuristic: {heuristic_label}")
 
     if not result:
         print("Result: no solution found")
@@ -125,6 +196,9 @@ def run_test(initial_state, goal_state, heuristic_key, heuristic_label, time_lim
     path, cost, processed_nodes, solved = result
 
     print(f"Result: solved={solved}, moves={cost}, processed_nodes={processed_nodes}")
+    print(f"Moves: {path.moves}")
+    if tree.stats is not None and tree.stats.bound is not None:
+        print(f"Suboptimality bound: {tree.stats.bound:.3f}")
     print(f"Time taken: {elapsed:.6f} seconds")
 
     # Optionally display full solution path
@@ -189,6 +263,7 @@ def main():
         print(row)
 
     heuristic_key, heuristic_label = choose_algorithm()
+    search_key, search_label = choose_search()
 
     # Optional time limit
     time_limit = input("(Optional) Provide time limit in seconds:")
@@ -204,7 +279,20 @@ def main():
             print("Invalid type. Time limit ignored")
             time_limit = None
 
-    run_test(initial_state, goal_state, heuristic_key, heuristic_label, time_limit)
+    # Optional memory limit (enforced by A* and SMA*)
+    memory_limit = input("(Optional) Provide memory limit in MB:")
+
+    if memory_limit.strip() == "":
+        max_bytes = None
+    else:
+        try:
+            max_bytes = int(memory_limit) * 1024 * 1024 or None
+        except ValueError:
+            print("Invalid type. Memory limit ignored")
+            max_bytes = None
+
+    run_test(initial_state, goal_state, heuristic_key, heuristic_label, time_limit,
+             search_key, search_label, max_bytes)
 
 if __name__ == "__main__":
     main()
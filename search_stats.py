@@ -0,0 +1,42 @@
+import time
+
+
+class SearchStats:
+
+    # Counters and timings collected during one search
+    def __init__(self):
+        self.status = "running"     # solved, timeout, exhausted, aborted or memory_limit
+        self.expansions = 0         # nodes popped and expanded
+        self.generated = 0          # children produced by expansions
+        self.duplicates = 0         # children pruned by best_g
+        self.stale = 0              # outdated open-list entries skipped
+        self.forgotten = 0          # nodes dropped by a memory-bounded search
+        self.reinserted = 0         # nodes put back on the open list by partial expansion
+        self.bound = None           # proven suboptimality factor of an anytime search
+        self.peak_open = 0          # largest open-list size
+        self.peak_best_g = 0        # largest best_g table size
+        self.heuristic_time = 0.0   # seconds spent evaluating h
+        self.expand_time = 0.0      # seconds spent generating children
+        self.queue_time = 0.0       # seconds spent in open-list push/pop
+        self.elapsed = 0.0
+        self._start = time.perf_counter()
+
+    # Refresh the elapsed time while the search is running
+    def update_elapsed(self):
+        self.elapsed = time.perf_counter() - self._start
+
+    # Record the final status and total time
+    def finish(self, status):
+        self.status = status
+        self.update_elapsed()
+        return self
+
+    # Continue the counters and elapsed time of a checkpointed run (a to_dict() result)
+    def resume(self, counters):
+        for key, value in counters.items():
+            if key != "status":
+                setattr(self, key, value)
+        self._start -= self.elapsed
+
+    def to_dict(self):
+        return {key: value for key, value in vars(self).items() if not key.startswith("_")}
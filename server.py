@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import time
+from collections import deque
+
+from batch import check_puzzle, solve_puzzle
+from run_test import SEARCHES
+
+LATENCY_WINDOW = 1000   # recent requests kept for latency percentiles
+# Searches that start their own processes; workers are daemonic and cannot have children
+PARALLEL = ("HDA_star", "parallel_IDA_star")
+# Workers replaced while clients are connected must not inherit their sockets, which
+# would keep closed connections open; forkserver children start from a clean process
+CONTEXT = mp.get_context("forkserver")
+
+
+# Worker process: solve jobs from the pipe until it is closed
+def _serve(connection):
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            return
+        try:
+            record = solve_puzzle(*job)
+        except Exception as error:   # e.g. an unknown heuristic; keep the worker alive
+            record = {"id": job[0], "status": "error", "error": str(error)}
+        connection.send(record)
+
+
+class Worker:
+
+    # One solver process and the pipe to it; killing it is how a search is cancelled
+    def __init__(self):
+        self.connection, child = CONTEXT.Pipe()
+        self.process = CONTEXT.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    async def run(self, job):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = self.connection.fileno()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            self.connection.send(job)
+            await ready
+        finally:
+            loop.remove_reader(fd)
+        return self.connection.recv()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+class SolverService:
+
+    # Line-delimited JSON solver: requests {"id", "board", "heuristic", "algorithm",
+    # "deadline"} get solve records back; {"op": "stats"} returns the metrics.
+    # Identical boards in flight share one search, which is killed once every request
+    # waiting on it has hit its deadline or disconnected.
+    def __init__(self, workers=4):
+        self.workers = [Worker() for _ in range(workers)]
+        self.idle = asyncio.Queue()
+        for worker in self.workers:
+            self.idle.put_nowait(worker)
+        self.in_flight = {}      # (board, heuristic, algorithm) -> [task, waiters]
+        self.queued = 0          # jobs waiting for a free worker
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counts = {"requests": 0, "solves": 0, "deduplicated": 0, "cancelled": 0}
+        self.connections = 0     # open client connections
+
+    def _respawn(self, worker):
+        worker.kill()
+        self.workers.remove(worker)
+        worker = Worker()
+        self.workers.append(worker)
+        return worker
+
+    # Run a job on the next free worker; a cancelled job kills and replaces its worker,
+    # and so does a worker that died (its job gets an error record)
+    async def _solve(self, job):
+        self.queued += 1
+        try:
+            worker = await self.idle.get()
+        finally:
+            self.queued -= 1
+
+        self.counts["solves"] += 1
+        try:
+            return await worker.run(job)
+        except asyncio.CancelledError:
+            self.counts["cancelled"] += 1
+            worker = self._respawn(worker)
+            raise
+        except Exception as error:   # EOFError, ConnectionResetError, ... from a dead worker
+            worker = self._respawn(worker)
+            return {"id": job[0], "status": "error", "error": f"worker failed: {error!r}"}
+        finally:
+            self.idle.put_nowait(worker)
+
+    async def handle(self, request):
+        start_time = time.perf_counter()
+        self.counts["requests"] += 1
+        try:
+            return await self._handle(request)
+        finally:
+            self.latencies.append(time.perf_counter() - start_time)
+
+    async def _handle(self, request):
+        puzzle_id = request.get("id")
+        board = request.get("board")
+        heuristic = request.get("heuristic", "manhattan_linear_conflict")
+        algorithm = request.get("algorithm", "A_star")
+        deadline = request.get("deadline")
+
+        if not isinstance(board, list) or not all(isinstance(row, list) for row in board):
+            return {"id": puzzle_id, "status": "invalid", "error": "board must be a matrix"}
+        if algorithm not in SEARCHES:
+            return {"id": puzzle_id, "status": "invalid", "error": f"unknown algorithm {algorithm}"}
+        if algorithm in PARALLEL:
+            return {"id": puzzle_id, "status": "invalid",
+                    "error": f"{algorithm} runs its own processes and is not served"}
+        if deadline is not None and (isinstance(deadline, bool)
+                                     or not isinstance(deadline, (int, float)) or deadline < 0):
+            return {"id": puzzle_id, "status": "invalid",
+                    "error": "deadline must be a non-negative number of seconds"}
+        problem = check_puzzle(board)
+        if problem is not None:
+            status, error = problem
+            return {"id": puzzle_id, "status": status, "error": error}
+
+        key = (tuple(map(tuple, board)), heuristic, algorithm)
+        entry = self.in_flight.get(key)
+        # A task that just finished or was cancelled is still listed until its callback runs
+        if entry is None or entry[0].done():
+            task = asyncio.ensure_future(
+                self._solve((puzzle_id, board, heuristic, algorithm, None)))
+            entry = self.in_flight[key] = [task, 0]
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.counts["deduplicated"] += 1
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            record = await asyncio.wait_for(asyncio.shield(task), deadline)
+        except asyncio.TimeoutError:
+            return {"id": puzzle_id, "status": "timeout", "moves": None, "cost": None,
+                    "processed_nodes": None, "time": deadline}
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+        return dict(record, id=puzzle_id)
+
+    # Drop a finished search unless a newer one has taken its key
+    def _forget(self, key, task):
+        entry = self.in_flight.get(key)
+        if entry is not None and entry[0] is task:
+            del self.in_flight[key]
+
+    def metrics(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return dict(self.counts, queue_depth=self.queued, in_flight=len(self.in_flight),
+                    workers=len(self.workers), connections=self.connections,
+                    latency_ms={"p50": percentile(0.5), "p90": percentile(0.9),
+                                "p99": percentile(0.99)})
+
+    # One client connection: requests are handled concurrently, answers written as ready
+    async def connection(self, reader, writer):
+        lock = asyncio.Lock()
+        pending = set()
+        self.connections += 1
+
+        async def answer(line):
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as error:
+                response = {"status": "invalid", "error": str(error)}
+            else:
+                if request.get("op") == "stats":
+                    response = dict(self.metrics(), id=request.get("id"))
+                else:
+                    response = await self.handle(request)
+            async with lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            # Requests of a closed connection stop waiting, which cancels lone searches
+            for task in pending:
+                task.cancel()
+            writer.close()
+            self.connections -= 1
+
+    # Listen on a Unix socket (path) or on localhost TCP
+    async def start(self, path=None, host="127.0.0.1", port=8765):
+        if path is not None:
+            return await asyncio.start_unix_server(self.connection, path=path)
+        return await asyncio.start_server(self.connection, host, port)
+
+    def close(self):
+        for worker in self.workers:
+            worker.kill()
+
+
+async def serve(path=None, host="127.0.0.1", port=8765, workers=4):
+    service = SolverService(workers)
+    server = await service.start(path, host, port)
+    print(f"Listening on {path or f'{host}:{port}'}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve N-puzzle solves over line-delimited JSON")
+    parser.add_argument("--unix", help="Unix socket path (default: TCP on --host/--port)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.unix, args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
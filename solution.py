@@ -0,0 +1,122 @@
+import json
+
+# Move names indexed by move code (the direction the blank moves), and their letters
+MOVES = ("Up", "Down", "Left", "Right")
+LETTERS = "UDLR"
+
+
+class Solution:
+
+    # Compact search result: the start board as bytes (row-major tiles) and the blank
+    # moves as a string of LETTERS, with the search's stats if it keeps them. Boards are
+    # rebuilt only when asked for; len, iteration and indexing give the
+    # (board, (move name, (x, y)) or None) pairs of to_list(), the former result format.
+    __slots__ = ("n", "start", "moves", "stats")
+
+    def __init__(self, n, start, moves, stats=None):
+        self.n = n
+        self.start = bytes(start)
+        self.moves = moves
+        self.stats = stats
+
+    @property
+    def cost(self):
+        return len(self.moves)
+
+    # Move codes, as used by Node
+    def codes(self):
+        return [LETTERS.index(letter) for letter in self.moves]
+
+    def names(self):
+        return [MOVES[code] for code in self.codes()]
+
+    # Flat board and blank cell after each move, the start first; the board is updated
+    # in place. Raises ValueError on a move off the board.
+    def _replay(self):
+        n = self.n
+        board = list(self.start)
+        zero = board.index(0)
+        yield board, zero, None
+        for step, letter in enumerate(self.moves):
+            code = LETTERS.find(letter)
+            x, y = divmod(zero, n)
+            if code < 0 or not (x > 0, x < n - 1, y > 0, y < n - 1)[code]:
+                raise ValueError(f"Move {step + 1} ({letter}) is not possible")
+            target = zero + (-n, n, -1, 1)[code]
+            board[zero], board[target] = board[target], 0
+            zero = target
+            yield board, zero, code
+
+    def _rows(self, board):
+        n = self.n
+        return tuple(tuple(board[i * n:(i + 1) * n]) for i in range(n))
+
+    # Boards (tuples of rows) from the start to the end, built one at a time
+    def states(self):
+        for board, _, _ in self._replay():
+            yield self._rows(board)
+
+    # (board, action) pairs of the former list result, built one at a time
+    def steps(self):
+        for board, zero, code in self._replay():
+            action = None if code is None else (MOVES[code], divmod(zero, self.n))
+            yield self._rows(board), action
+
+    def to_list(self):
+        return list(self.steps())
+
+    # Replay the moves from the start board in O(length): True when every move stays on
+    # the board and the last board is the goal (rows; default row-major, blank last)
+    def verify(self, goal_state=None):
+        cells = self.n * self.n
+        if goal_state is None:
+            goal = list(range(1, cells)) + [0]
+        else:
+            goal = [tile for row in goal_state for tile in row]
+
+        board = None
+        try:
+            for board, _, _ in self._replay():
+                pass
+        except ValueError:
+            return False
+        return board == goal
+
+    def to_dict(self):
+        stats = self.stats
+        if stats is not None and not isinstance(stats, dict):
+            stats = stats.to_dict()
+        return {"n": self.n, "start": list(self.start), "moves": self.moves,
+                "cost": self.cost, "stats": stats}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["n"], data["start"], data["moves"], data.get("stats"))
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def __len__(self):
+        return len(self.moves) + 1
+
+    def __iter__(self):
+        return self.steps()
+
+    def __getitem__(self, index):
+        return self.to_list()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, Solution):
+            return (self.n, self.start, self.moves) == (other.n, other.start, other.moves)
+        if isinstance(other, (list, tuple)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Solution(n={self.n}, cost={self.cost}, moves={self.moves!r})"
@@ -0,0 +1,101 @@
+import sqlite3
+import time
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+# Packed state (or goal) as a compact blob key
+def _key(state):
+    return state.to_bytes((state.bit_length() + 7) // 8, "little")
+
+
+class SolutionCache:
+
+    # On-disk table of exact distances to the goal and the best move from each state,
+    # keyed by (goal, state). Least recently used entries beyond max_entries are evicted.
+    # A goal's entries are read into memory on its first lookup, so searches can probe
+    # the cache for every generated state.
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.lookups = 0
+        self._entries = {}     # goal -> {state: (distance, move)}
+        self._touched = {}     # (goal, state) hit since the last write -> time
+
+        # Several batch workers may share one file
+        self.connection = sqlite3.connect(path, timeout=30)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS states ("
+                " goal BLOB NOT NULL, state BLOB NOT NULL, distance INTEGER NOT NULL,"
+                " move INTEGER, used REAL NOT NULL, PRIMARY KEY (goal, state))")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS states_used ON states (used)")
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM states").fetchone()[0]
+
+    # Share of lookups that found the state
+    @property
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    # Entries of one goal, read from disk the first time
+    def _goal_entries(self, goal):
+        entries = self._entries.get(goal)
+        if entries is None:
+            rows = self.connection.execute(
+                "SELECT state, distance, move FROM states WHERE goal = ?", (_key(goal),))
+            entries = {int.from_bytes(state, "little"): (distance, move)
+                       for state, distance, move in rows}
+            self._entries[goal] = entries
+        return entries
+
+    # (distance, move code) for a state, or None; move is None at the goal
+    def lookup(self, goal, state):
+        self.lookups += 1
+        entry = self._goal_entries(goal).get(state)
+        if entry is None:
+            return None
+        self.hits += 1
+        self._touched[goal, state] = time.time()
+        return entry
+
+    # Exact distance of a state to the goal, or None
+    def distance(self, goal, state):
+        row = self.lookup(goal, state)
+        return None if row is None else row[0]
+
+    # Insert (state, distance, move) entries for one goal, then evict down to max_entries
+    def store(self, goal, entries):
+        now = time.time()
+        goal_key = _key(goal)
+        known = self._goal_entries(goal)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO states VALUES (?, ?, ?, ?, ?)",
+                [(goal_key, _key(state), distance, move, now)
+                 for state, distance, move in entries])
+            for state, distance, move in entries:
+                known[state] = (distance, move)
+            self._flush_touched()
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                self.connection.execute(
+                    "DELETE FROM states WHERE rowid IN"
+                    " (SELECT rowid FROM states ORDER BY used LIMIT ?)", (excess,))
+                self._entries = {}    # reread what survived on the next lookup
+
+    # Record recent hits so eviction keeps the entries in use
+    def _flush_touched(self):
+        if self._touched:
+            self.connection.executemany(
+                "UPDATE states SET used = ? WHERE goal = ? AND state = ? AND used < ?",
+                [(used, _key(goal), _key(state), used)
+                 for (goal, state), used in self._touched.items()])
+            self._touched = {}
+
+    def close(self):
+        with self.connection:
+            self._flush_touched()
+        self.connection.close()
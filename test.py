@@ -1,5 +1,33 @@
+import asyncio
+import io
+import json
+import os
+import pickle
+import random
+import tempfile
+import tracemalloc
 import unittest
-from Node import SearchTree
+from Node import NODE_BYTES, NodeStore, SearchTree
+from batch import check_puzzle, read_puzzles, run_batch, solve_puzzle
+from checkpoint import resume_search
+from constructive import constructive_solve, shorten
+from hda import hda_star
+from parallel_ida import parallel_ida_star, split
+from benchmark import (
+    compare,
+    direct_heuristic,
+    korf_board,
+    korf_instances,
+    random_instances,
+    random_walk_instances,
+    run_suite
+)
+from open_list import BucketOpenList
+from pattern_db import PatternDatabase, rank, unrank
+from perfect_db import PerfectDatabase
+from solution import Solution
+from solution_cache import SolutionCache
+from server import SolverService
 from run_test import (
     generate_goal_state,
     validate_matrix,
@@ -8,6 +36,12 @@ from run_test import (
     count_relative_inversions
 )
 
+try:
+    import numpy
+    from vectorized import BatchScorer, batched_a_star, screen_boards
+except ImportError:   # NumPy not installed
+    batched_a_star = None
+
 
 class TestNPuzzle(unittest.TestCase):
 
@@ -69,6 +103,45 @@ class TestNPuzzle(unittest.TestCase):
         tree = SearchTree(state, self.goal_3, "gasching")
         self.assertEqual(tree.Gashing_dist(tree.root.state), 1)
 
+    def test_gasching_matches_grid_version(self):
+        # The previous grid-scanning implementation, kept as the reference
+        def grid_gasching(board, goal):
+            n = len(board)
+            position = {goal[i][j]: (i, j) for i in range(n) for j in range(n)}
+            temp = [list(row) for row in board]
+            res = 0
+            while any(tile != 0 and position[tile] != (i, j)
+                      for i, row in enumerate(temp) for j, tile in enumerate(row)):
+                zero_x, zero_y = find_zero(temp)
+                if (zero_x, zero_y) != position[0]:
+                    tile = goal[zero_x][zero_y]
+                    for i in range(n):
+                        for j in range(n):
+                            if temp[i][j] == tile:
+                                gx, gy = i, j
+                    temp[gx][gy], temp[zero_x][zero_y] = temp[zero_x][zero_y], temp[gx][gy]
+                else:
+                    for i in range(n):
+                        for j in range(n):
+                            if temp[i][j] != 0:
+                                gx, gy = position[temp[i][j]]
+                                if (i, j) != (gx, gy):
+                                    temp[gx][gy], temp[i][j] = temp[i][j], temp[gx][gy]
+                                    break
+                    else:
+                        continue
+                res += 1
+            return res
+
+        rng = random.Random(11)
+        for goal in (self.goal_3, self.goal_4, self.goal_5):
+            n = len(goal)
+            tree = SearchTree(goal, goal, "gasching")
+            for _ in range(50):
+                tiles = rng.sample(range(n * n), n * n)
+                board = [tiles[i * n:(i + 1) * n] for i in range(n)]
+                self.assertEqual(tree.Gashing_dist(tree.encode(board)), grid_gasching(board, goal))
+
     def test_linear_conflict_dominates_manhattan(self):
         state = [
             [2, 1, 3],
@@ -82,6 +155,122 @@ class TestNPuzzle(unittest.TestCase):
 
         self.assertGreaterEqual(combined, manhattan)
 
+    def test_incremental_heuristic_matches_full(self):
+        rng = random.Random(7)
+        for goal in (self.goal_3, self.goal_4, self.goal_5):
+            for name in ("manhattan_linear_conflict", "manhattan", "misplaced_tiles", "gasching"):
+                tree = SearchTree(goal, goal, name)
+                node = tree.root
+                node.h = tree.heuristic(node.state)
+                for _ in range(200):
+                    child = rng.choice(node.expand(tree.n, tree.bits))
+                    child.h = tree.update_heuristic(node, child)
+                    self.assertEqual(child.h, tree.heuristic(child.state))
+                    if name == "manhattan_linear_conflict":
+                        self.assertEqual(child.h, tree.manhattan_dist(child.state)
+                                         + tree.linear_conflict(child.state))
+                    node = child
+
+    def test_conflict_table_counts_inversions(self):
+        table = SearchTree.conflict_table(4)
+
+        self.assertEqual(len(table), 5 ** 4)
+        self.assertEqual(table[0], 0)
+        self.assertEqual(table[((4 * 5 + 3) * 5 + 2) * 5 + 1], 6)      # 4 3 2 1
+        self.assertEqual(table[((2 * 5 + 0) * 5 + 1) * 5 + 0], 1)      # 2 _ 1 _
+        self.assertEqual(table[((1 * 5 + 2) * 5 + 3) * 5 + 4], 0)      # 1 2 3 4
+
+    def test_heuristic_tables_match_direct(self):
+        for n in (3, 4, 5, 6):
+            goal = generate_goal_state(n)
+            tree = SearchTree(goal, goal)
+            for _, board, _ in random_instances(n, 30, seed=n):
+                state = tree.encode(board)
+                self.assertEqual(tree.heuristic(state), direct_heuristic(tree, state))
+
+    def test_pattern_rank_roundtrip(self):
+        for index in range(9 * 8 * 7):
+            self.assertEqual(rank(unrank(index, 3, 9), 9), index)
+
+    def test_pattern_database_roundtrip_and_admissible(self):
+        db = PatternDatabase.build(self.goal_3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pdb_3x3.pdb")
+            db.save(path)
+            loaded = PatternDatabase.load(path)
+
+            self.assertEqual(loaded.patterns, db.patterns)
+            self.assertEqual(bytes(loaded.tables[0]), bytes(db.tables[0]))
+
+            state = [
+                [4, 1, 3],
+                [7, 2, 6],
+                [0, 5, 8]
+            ]
+            tree = SearchTree(state, self.goal_3, "pattern_database", loaded)
+            self.assertEqual(tree.heuristic(tree.goal_state), 0)
+            self.assertGreaterEqual(tree.heuristic(tree.root.state),
+                                    tree.manhattan_dist(tree.root.state))
+
+            path, cost, processed_nodes, solved = tree.A_star()
+            self.assertTrue(solved)
+            self.assertEqual(cost, SearchTree(state, self.goal_3).A_star()[1])
+            self.assertEqual(tree.IDA_star()[1], cost)
+
+    def test_pattern_database_incremental_matches_full(self):
+        rng = random.Random(11)
+        db = PatternDatabase.build(self.goal_3, ((1, 2, 3), (4, 5, 6), (7, 8)))
+        tree = SearchTree(self.goal_3, self.goal_3, "pattern_database", db)
+        node = tree.root
+        node.h = tree.heuristic(node.state)
+        for _ in range(200):
+            child = rng.choice(node.expand(tree.n, tree.bits))
+            child.h = tree.update_heuristic(node, child)
+            self.assertEqual(child.h, tree.heuristic(child.state))
+            node = child
+
+    def test_pattern_database_wrong_goal(self):
+        db = PatternDatabase.build(self.goal_3, ((1, 2, 3, 4), (5, 6, 7, 8)))
+        other_goal = [
+            [0, 1, 2],
+            [3, 4, 5],
+            [6, 7, 8]
+        ]
+        with self.assertRaises(ValueError):
+            SearchTree(self.solved_3, other_goal, "pattern_database", db)
+
+    def test_perfect_table_exact_distances(self):
+        db = PerfectDatabase.build(self.goal_3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "perfect_3x3.pdb")
+            db.save(path)
+            self.assertLess(os.path.getsize(path), 9 * 8 * 7 * 6 * 5 * 4 * 3 * 2 // 2 + 64)
+            loaded = PerfectDatabase.load(path)
+
+            for _, board, _ in random_instances(3, 10, seed=6):
+                tree = SearchTree(board, self.goal_3, perfect_db=loaded)
+                cost = SearchTree(board, self.goal_3).A_star()[1]
+                self.assertEqual(tree.perfect_dist(tree.root.state), cost)
+
+                # A_star descends the table without searching
+                path, found, processed_nodes, solved = tree.A_star()
+                self.assertEqual((found, processed_nodes, len(path)), (cost, cost + 1, cost + 1))
+                self.assertEqual(path[-1][0], tuple(map(tuple, self.goal_3)))
+
+                tree = SearchTree(board, self.goal_3, "perfect", perfect_db=loaded)
+                self.assertEqual(tree.IDA_star()[1], cost)
+
+            odd = [[1, 2, 3], [4, 5, 6], [8, 7, 0]]
+            self.assertIsNone(loaded.distance([tile for row in odd for tile in row]))
+
+        # Another goal with the blank in the same cell is relabelled
+        other_goal = [[8, 7, 6], [5, 4, 3], [2, 1, 0]]
+        state = [[8, 7, 6], [5, 0, 3], [2, 4, 1]]
+        tree = SearchTree(state, other_goal, perfect_db=db)
+        self.assertEqual(tree.A_star()[1], SearchTree(state, other_goal).A_star()[1])
+        with self.assertRaises(ValueError):
+            SearchTree(self.solved_3, [[0, 1, 2], [3, 4, 5], [6, 7, 8]], perfect_db=db)
+
     # ======================================================
     # SOLVABILITY TESTS
     # ======================================================
@@ -212,6 +401,468 @@ class TestNPuzzle(unittest.TestCase):
 
         self.assertFalse(result)
 
+    def test_idastar_trivial(self):
+        tree = SearchTree(self.solved_3, self.goal_3, "manhattan")
+        path, cost, processed_nodes, solved = tree.IDA_star()
+
+        self.assertTrue(solved)
+        self.assertEqual(cost, 0)
+        self.assertEqual(len(path), 1)
+
+    def test_idastar_matches_astar(self):
+        state = [
+            [4, 1, 3],
+            [7, 2, 6],
+            [0, 5, 8]
+        ]
+        for name in ("manhattan_linear_conflict", "manhattan", "misplaced_tiles", "gasching"):
+            expected = SearchTree(state, self.goal_3, name).A_star()
+            path, cost, processed_nodes, solved = SearchTree(state, self.goal_3, name).IDA_star()
+
+            self.assertTrue(solved)
+            self.assertEqual(cost, expected[1])
+            self.assertEqual(path[0][0], expected[0][0][0])
+            self.assertEqual(path[-1][0], tuple(tuple(row) for row in self.goal_3))
+
+    def test_idastar_time_limit(self):
+        state = [
+            [8, 6, 7],
+            [2, 5, 4],
+            [3, 0, 1]
+        ]
+        tree = SearchTree(state, self.goal_3)
+
+        result = tree.IDA_star(time_limit=0.0001)
+
+        self.assertFalse(result)
+
+    def test_idastar_unsolvable_returns_none(self):
+        state = [
+            [1,  2,  3,  4],
+            [5,  6,  7,  8],
+            [9, 10, 11, 12],
+            [13, 15, 14,  0]
+        ]
+        tree = SearchTree(state, self.goal_4)
+
+        self.assertFalse(tree.solvable())
+        self.assertIsNone(tree.IDA_star())
+        self.assertTrue(SearchTree(self.goal_4, self.goal_4).solvable())
+
+    def test_parallel_ida_star_unsolvable_returns_none(self):
+        state = [
+            [1,  2,  3,  4],
+            [5,  6,  7,  8],
+            [9, 10, 11, 12],
+            [13, 15, 14,  0]
+        ]
+        tree = SearchTree(state, self.goal_4)
+
+        self.assertIsNone(parallel_ida_star(tree, workers=2))
+
+    def test_bucket_open_list_order(self):
+        frontier = BucketOpenList()
+        frontier.push(5, 1, "a")
+        frontier.push(5, 3, "b")
+        frontier.push(4, 0, "c")
+        frontier.push(5, 3, "d")
+
+        self.assertEqual([frontier.pop() for _ in range(4)], ["c", "d", "b", "a"])
+        self.assertEqual(len(frontier), 0)
+        with self.assertRaises(IndexError):
+            frontier.pop()
+
+    def test_astar_buckets_matches_heap(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        heap = SearchTree(state, self.goal_3).A_star()
+        buckets = SearchTree(state, self.goal_3).A_star(open_list="buckets")
+
+        self.assertTrue(buckets[3])
+        self.assertEqual(buckets[1], heap[1])
+        self.assertLessEqual(buckets[2], heap[2])
+
+    def test_node_store_chain(self):
+        store = NodeStore()
+        root = store.add(10, 8, 0, 4)
+        child = store.add(11, 7, 1, 3, root, 3)
+
+        node = store.chain(child)
+        self.assertEqual((node.state, node.g, node.h, node.move, node.zero), (11, 1, 3, 3, 7))
+        self.assertEqual((node.parent.state, node.parent.move), (10, None))
+        self.assertIsNone(node.parent.parent)
+
+    def test_astar_peak_memory_per_node(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        tree = SearchTree(state, self.goal_3)
+
+        tracemalloc.start()
+        path, cost, processed_nodes, solved = tree.A_star()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        self.assertTrue(solved)
+        self.assertLess(peak / processed_nodes, 200)
+
+    def test_hdastar_matches_astar(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        path, cost, processed_nodes, solved = hda_star(SearchTree(state, self.goal_3), workers=2)
+
+        self.assertTrue(solved)
+        self.assertEqual(cost, 25)
+        self.assertEqual(len(path), cost + 1)
+        self.assertEqual(path[0][0], tuple(tuple(row) for row in state))
+        self.assertEqual(path[-1][0], tuple(tuple(row) for row in self.goal_3))
+
+    def test_parallel_ida_star_matches_ida_star(self):
+        for _, board, _ in random_walk_instances(4, 3, 40, seed=9):
+            expected = SearchTree(board, self.goal_4).IDA_star()[1]
+            path, cost, processed_nodes, solved = parallel_ida_star(
+                SearchTree(board, self.goal_4), workers=2)
+            self.assertTrue(solved)
+            self.assertEqual(cost, expected)
+            self.assertEqual(len(path), cost + 1)
+            self.assertEqual(path[-1][0], tuple(map(tuple, self.goal_4)))
+
+    def test_parallel_ida_star_goal_above_split(self):
+        state = [
+            [1, 2, 3],
+            [4, 0, 6],
+            [7, 5, 8]
+        ]
+        tree = SearchTree(state, self.goal_3)
+        subproblems, best, generated = split(tree, 4)
+        self.assertEqual(len(best), 2)
+        self.assertTrue(all(len(moves) == 4 for moves, fs in subproblems))
+
+        path, cost, processed_nodes, solved = parallel_ida_star(tree, split_depth=4)
+        self.assertEqual(cost, 2)
+
+    def test_hdastar_trivial(self):
+        path, cost, processed_nodes, solved = hda_star(SearchTree(self.solved_3, self.goal_3))
+
+        self.assertTrue(solved)
+        self.assertEqual(cost, 0)
+
+    def test_bidirectional_matches_astar(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        for name in ("manhattan_linear_conflict", "misplaced_tiles"):
+            path, cost, processed_nodes, solved = SearchTree(state, self.goal_3, name).bidirectional()
+
+            self.assertTrue(solved)
+            self.assertEqual(cost, 25)
+            self.assertEqual(len(path), cost + 1)
+            self.assertEqual(path[0], (tuple(tuple(row) for row in state), None))
+            self.assertEqual(path[-1][0], tuple(tuple(row) for row in self.goal_3))
+            for (before, _), (after, (_, (x, y))) in zip(path, path[1:]):
+                self.assertEqual(after[x][y], 0)
+                self.assertEqual(sum(a != b for r1, r2 in zip(before, after)
+                                     for a, b in zip(r1, r2)), 2)
+
+    def test_bidirectional_5x5(self):
+        state = [
+            [11, 1, 2, 3, 14],
+            [12, 7, 9, 10, 13],
+            [6, 8, 18, 5, 4],
+            [21, 16, 17, 19, 15],
+            [22, 23, 0, 24, 20],
+        ]
+        path, cost, processed_nodes, solved = SearchTree(state, self.goal_5).bidirectional()
+
+        self.assertTrue(solved)
+        self.assertEqual(cost, 38)
+
+    def test_bidirectional_records_own_stats(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        tree = SearchTree(state, self.goal_3)
+        tree.A_star()
+        path, cost, processed_nodes, solved = tree.bidirectional()
+
+        self.assertEqual(tree.stats.status, "solved")
+        self.assertGreater(tree.stats.expansions, 0)
+        self.assertIs(path.stats, tree.stats)
+
+        # The backward direction cannot use the perfect table of the standard goal
+        db = PerfectDatabase.build(self.goal_3)
+        path, cost, processed_nodes, solved = SearchTree(
+            state, self.goal_3, "perfect", perfect_db=db).bidirectional()
+        self.assertEqual(cost, 25)
+        self.assertTrue(path.verify())
+
+    def test_expand_skips_parent_move(self):
+        tree = SearchTree(self.solved_3, self.goal_3)
+        root = tree.root
+        self.assertEqual(len(root.expand(tree.n, tree.bits)), 2)
+        for child in root.expand(tree.n, tree.bits):
+            states = [grandchild.state for grandchild in child.expand(tree.n, tree.bits)]
+            self.assertNotIn(root.state, states)
+            self.assertEqual(len(states), 2)
+
+    def test_epea_star_matches_astar(self):
+        for name in ("manhattan_linear_conflict", "manhattan", "misplaced_tiles", "gasching"):
+            for _, board, _ in random_walk_instances(3, 3, 20, seed=4):
+                optimal = SearchTree(board, self.goal_3, name).A_star()[1]
+                for open_list in ("heap", "buckets"):
+                    tree = SearchTree(board, self.goal_3, name)
+                    path, cost, processed_nodes, solved = tree.EPEA_star(open_list=open_list)
+                    self.assertEqual(cost, optimal)
+                    self.assertEqual(len(path), cost + 1)
+                    self.assertEqual(tree.stats.status, "solved")
+
+    def test_epea_star_stores_fewer_nodes(self):
+        _, board, _ = random_walk_instances(4, 1, 40, seed=1)[0]
+        astar = SearchTree(board, self.goal_4)
+        epea = SearchTree(board, self.goal_4)
+        full = astar.A_star()
+        partial = epea.EPEA_star()
+
+        self.assertEqual(partial[1], full[1])
+        self.assertLess(partial[2], full[2])
+        self.assertLess(epea.stats.peak_open, astar.stats.peak_open)
+        self.assertGreater(epea.stats.reinserted, 0)
+
+    def test_astar_stats_on_success(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        tree = SearchTree(state, self.goal_3)
+        path, cost, processed_nodes, solved = tree.A_star()
+        stats = tree.stats
+
+        self.assertEqual(stats.status, "solved")
+        self.assertEqual(stats.generated, processed_nodes - 1 + stats.duplicates)
+        self.assertGreater(stats.expansions, 0)
+        self.assertGreater(stats.peak_open, 0)
+        self.assertGreaterEqual(stats.peak_best_g, stats.peak_open)
+        self.assertGreater(stats.heuristic_time, 0)
+        self.assertIn("stale", stats.to_dict())
+
+    def test_astar_stats_on_timeout(self):
+        state = [
+            [8, 6, 7],
+            [2, 5, 4],
+            [3, 0, 1]
+        ]
+        tree = SearchTree(state, self.goal_3)
+
+        self.assertFalse(tree.A_star(time_limit=0.0001))
+        self.assertEqual(tree.stats.status, "timeout")
+
+    def test_astar_progress_callback_aborts(self):
+        state = [
+            [8, 6, 7],
+            [2, 5, 4],
+            [3, 0, 1]
+        ]
+        seen = []
+
+        def progress(stats):
+            seen.append(stats.expansions)
+            return len(seen) < 3
+
+        tree = SearchTree(state, self.goal_3)
+        result = tree.A_star(progress=progress, progress_every=10)
+
+        self.assertFalse(result)
+        self.assertEqual(seen, [10, 20, 30])
+        self.assertEqual(tree.stats.status, "aborted")
+        self.assertEqual(tree.stats.expansions, 30)
+
+    def test_astar_rejects_progress_every_below_one(self):
+        tree = SearchTree(self.goal_3, self.goal_3)
+
+        with self.assertRaises(ValueError):
+            tree.A_star(progress=lambda stats: True, progress_every=0)
+
+    def test_smastar_matches_astar_within_budget(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        tree = SearchTree(state, self.goal_3, max_nodes=50)
+        path, cost, processed_nodes, solved = tree.SMA_star()
+
+        self.assertTrue(solved)
+        self.assertEqual(cost, 25)
+        self.assertEqual(len(path), cost + 1)
+        self.assertEqual(tree.stats.status, "solved")
+        self.assertGreater(tree.stats.forgotten, 0)
+        self.assertLessEqual(tree.stats.peak_open, 50)
+
+    def test_smastar_budget_below_heuristic(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        tree = SearchTree(state, self.goal_3, max_nodes=5)
+
+        self.assertFalse(tree.SMA_star())
+        self.assertEqual(tree.stats.status, "memory_limit")
+
+    def test_smastar_tight_budget_finishes(self):
+        state = [
+            [8, 2, 7],
+            [5, 6, 4],
+            [0, 3, 1]
+        ]
+        tree = SearchTree(state, self.goal_3, max_nodes=29)
+        path, cost, processed_nodes, solved = tree.SMA_star(time_limit=10)
+
+        self.assertTrue(solved)
+        self.assertEqual(cost, 28)
+        self.assertEqual(tree.stats.status, "solved")
+
+    def test_astar_memory_limit(self):
+        state = [
+            [8, 6, 7],
+            [2, 5, 4],
+            [3, 0, 1]
+        ]
+        tree = SearchTree(state, self.goal_3, max_bytes=1000 * NODE_BYTES)
+
+        self.assertEqual(tree.max_nodes, 1000)
+        self.assertFalse(tree.A_star())
+        self.assertEqual(tree.stats.status, "memory_limit")
+
+    @unittest.skipIf(batched_a_star is None, "NumPy not installed")
+    def test_screen_boards_matches_scalar_checks(self):
+        rng = random.Random(5)
+        for n in (3, 4, 5):
+            boards = []
+            for _ in range(200):
+                tiles = rng.sample(range(n * n), n * n)
+                if rng.random() < 0.2:
+                    tiles[rng.randrange(n * n)] = rng.randrange(-1, n * n + 1)
+                boards.append(tiles)
+            goal_tiles = rng.sample(range(n * n), n * n)
+
+            for goal in (generate_goal_state(n),
+                         [goal_tiles[i * n:(i + 1) * n] for i in range(n)]):
+                valid, solvable = screen_boards(numpy.array(boards), goal)
+                for tiles, is_valid, can_solve in zip(boards, valid, solvable):
+                    matrix = [tiles[i * n:(i + 1) * n] for i in range(n)]
+                    try:
+                        validate_matrix(matrix, n)
+                    except ValueError:
+                        self.assertFalse(is_valid)
+                        self.assertFalse(can_solve)
+                        continue
+                    self.assertTrue(is_valid)
+                    self.assertEqual(can_solve, is_solvable(matrix, goal))
+
+        odd = [[1, 2, 3], [4, 5, 6], [8, 7, 0]]
+        valid, solvable = screen_boards(numpy.array([self.solved_3, odd]))
+        self.assertEqual(valid.tolist(), [True, True])
+        self.assertEqual(solvable.tolist(), [True, False])
+        with self.assertRaises(ValueError):
+            screen_boards(numpy.zeros((2, 5), dtype=int))
+
+    @unittest.skipIf(batched_a_star is None, "NumPy not installed")
+    def test_batched_scores_match_heuristic(self):
+        rng = random.Random(3)
+        for goal in (self.goal_3, self.goal_5):
+            n = len(goal)
+            for name in ("manhattan_linear_conflict", "manhattan", "misplaced_tiles"):
+                tree = SearchTree(goal, goal, name)
+                boards = [rng.sample(range(n * n), n * n) for _ in range(50)]
+                scores = BatchScorer(tree).score(numpy.array(boards, dtype=numpy.uint8))
+
+                self.assertEqual(scores.tolist(), [tree.heuristic(tree.pack(b)) for b in boards])
+
+    @unittest.skipIf(batched_a_star is None, "NumPy not installed")
+    def test_batched_astar_matches_astar(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        expected = SearchTree(state, self.goal_3).A_star()
+
+        # A batch of one expands exactly the nodes A* does
+        self.assertEqual(batched_a_star(SearchTree(state, self.goal_3), batch=1), expected)
+
+        tree = SearchTree(state, self.goal_3)
+        path, cost, processed_nodes, solved = batched_a_star(tree)
+        self.assertTrue(solved)
+        self.assertEqual(cost, 25)
+        self.assertEqual(path[0], expected[0][0])
+        self.assertEqual(path[-1], expected[0][-1])
+        self.assertEqual(tree.stats.status, "solved")
+
+    @unittest.skipIf(batched_a_star is None, "NumPy not installed")
+    def test_batched_astar_5x5(self):
+        state = [
+            [11, 1, 2, 3, 14],
+            [12, 7, 9, 10, 13],
+            [6, 8, 18, 5, 4],
+            [21, 16, 17, 19, 15],
+            [22, 23, 0, 24, 20],
+        ]
+        path, cost, processed_nodes, solved = batched_a_star(SearchTree(state, self.goal_5))
+
+        self.assertTrue(solved)
+        self.assertEqual(cost, 38)
+        self.assertEqual(len(path), cost + 1)
+
+    def test_arastar_improves_to_optimal(self):
+        state = [
+            [5, 1, 15, 7],
+            [8, 4, 2, 11],
+            [0, 6, 3, 14],
+            [12, 9, 10, 13]
+        ]
+        tree = SearchTree(state, self.goal_4)
+        solutions = list(tree.ARA_star_solutions(weight=2.0))
+        costs = [cost for _, cost, _ in solutions]
+        bounds = [bound for _, _, bound in solutions]
+
+        self.assertEqual(costs, sorted(costs, reverse=True))
+        self.assertEqual(costs[-1], 44)
+        self.assertEqual(bounds[-1], 1.0)
+        self.assertEqual(tree.stats.status, "solved")
+        for path, cost, bound in solutions:
+            self.assertEqual(len(path), cost + 1)
+            self.assertLessEqual(cost, bound * 44)
+
+    def test_arastar_returns_best_path_on_timeout(self):
+        state = [
+            [5, 1, 15, 7],
+            [8, 4, 2, 11],
+            [0, 6, 3, 14],
+            [12, 9, 10, 13]
+        ]
+        tree = SearchTree(state, self.goal_4)
+        path, cost, processed_nodes, solved = tree.ARA_star(time_limit=0.3, weight=3.0)
+
+        self.assertTrue(solved)
+        self.assertEqual(len(path), cost + 1)
+        self.assertGreaterEqual(cost, 44)
+        self.assertLessEqual(cost, tree.stats.bound * 44)
+        self.assertEqual(tree.stats.status, "timeout")
+
     # ======================================================
     # 5x5 INTEGRATION TEST
     # ======================================================
@@ -231,6 +882,499 @@ class TestNPuzzle(unittest.TestCase):
         self.assertTrue(solved)
         self.assertEqual(cost, 38)
 
+    def test_idastar_5x5(self):
+        state = [
+            [11, 1, 2, 3, 14],
+            [12, 7, 9, 10, 13],
+            [6, 8, 18, 5, 4],
+            [21, 16, 17, 19, 15],
+            [22, 23, 0, 24, 20],
+        ]
+
+        tree = SearchTree(state, self.goal_5)
+        path, cost, processed_nodes, solved = tree.IDA_star()
+
+        self.assertTrue(solved)
+        self.assertEqual(cost, 38)
+
+    # ======================================================
+    # STATE ENCODING TESTS
+    # ======================================================
+
+    def test_encode_decode_roundtrip(self):
+        tree = SearchTree(self.solved_3, self.goal_5)
+        board = [
+            [11, 1, 2, 3, 14],
+            [12, 7, 9, 10, 13],
+            [6, 8, 18, 5, 4],
+            [21, 16, 17, 19, 15],
+            [22, 23, 0, 24, 20],
+        ]
+        self.assertEqual(tree.decode(tree.encode(board)), tuple(tuple(row) for row in board))
+
+    def test_expand_moves_blank(self):
+        state = [
+            [1, 2, 3],
+            [4, 0, 6],
+            [7, 5, 8]
+        ]
+        tree = SearchTree(state, self.goal_3)
+        children = tree.root.expand(tree.n, tree.bits)
+
+        self.assertEqual(len(children), 4)
+        down = tree.decode(children[1].state)
+        self.assertEqual(down, ((1, 2, 3), (4, 5, 6), (7, 0, 8)))
+        self.assertEqual(children[1].zero, 7)
+
+    def test_solution_returns_tuples(self):
+        state = [
+            [1, 2, 3],
+            [4, 5, 6],
+            [0, 7, 8]
+        ]
+        tree = SearchTree(state, self.goal_3)
+        path, cost, processed_nodes, solved = tree.A_star()
+
+        self.assertEqual(path[0], (tuple(tuple(row) for row in state), None))
+        self.assertEqual(path[-1], (tuple(tuple(row) for row in self.goal_3), ("Right", (2, 2))))
+
+    def test_solution_is_compact_move_string(self):
+        state = [
+            [1, 2, 3],
+            [4, 5, 6],
+            [0, 7, 8]
+        ]
+        path, cost, _, _ = SearchTree(state, self.goal_3).A_star()
+
+        self.assertIsInstance(path, Solution)
+        self.assertEqual(path.moves, "RR")
+        self.assertEqual(path.cost, cost)
+        self.assertEqual(path.names(), ["Right", "Right"])
+        self.assertEqual(len(path), 3)
+        self.assertEqual(path.to_list(), list(path))
+        self.assertEqual(path, path.to_list())
+
+    def test_solution_verify_replays_moves(self):
+        _, board, _ = random_walk_instances(4, 1, 40, seed=5)[0]
+        path = SearchTree(board, self.goal_4).A_star()[0]
+
+        self.assertTrue(path.verify())
+        self.assertTrue(path.verify(self.goal_4))
+        self.assertFalse(Solution(path.n, path.start, path.moves[:-1]).verify())
+        # A move off the board or an unknown letter fails instead of raising
+        self.assertFalse(Solution(4, path.start, path.moves + "X").verify())
+        self.assertFalse(Solution(3, bytes([0, 1, 2, 3, 4, 5, 6, 7, 8]), "U").verify())
+
+    def test_solution_states_are_lazy(self):
+        _, board, _ = random_walk_instances(4, 1, 40, seed=6)[0]
+        path = SearchTree(board, self.goal_4).A_star()[0]
+
+        states = path.states()
+        self.assertEqual(next(states), tuple(tuple(row) for row in board))
+        boards = [board for board, _ in path.to_list()]
+        self.assertEqual(boards[1:], list(states))
+        self.assertEqual(boards[-1], tuple(tuple(row) for row in self.goal_4))
+
+    def test_solution_json_roundtrip(self):
+        _, board, _ = random_walk_instances(4, 1, 40, seed=7)[0]
+        path = SearchTree(board, self.goal_4).A_star()[0]
+
+        data = json.loads(path.to_json())
+        self.assertEqual(data["moves"], path.moves)
+        self.assertEqual(data["stats"]["status"], "solved")
+        copy = Solution.from_json(path.to_json())
+        self.assertEqual(copy, path)
+        self.assertTrue(copy.verify())
+
+    def test_solution_pickles_smaller_than_list(self):
+        _, board, _ = random_walk_instances(4, 1, 60, seed=8)[0]
+        path = SearchTree(board, self.goal_4).IDA_star()[0]
+
+        self.assertLess(len(pickle.dumps(path)) * 4, len(pickle.dumps(path.to_list())))
+
+    # ======================================================
+    # CONSTRUCTIVE SOLVER TESTS
+    # ======================================================
+
+    def test_constructive_solves_large_boards(self):
+        for n in (3, 4, 6, 10):
+            goal = generate_goal_state(n)
+            for _, board, _ in random_instances(n, 3, seed=n):
+                path, cost, processed_nodes, solved = constructive_solve(SearchTree(board, goal))
+
+                self.assertTrue(solved)
+                self.assertEqual(len(path), cost + 1)
+                self.assertEqual(path[0][0], tuple(tuple(row) for row in board))
+                self.assertEqual(path[-1][0], tuple(tuple(row) for row in goal))
+                for (before, _), (after, (_, (x, y))) in zip(path, path[1:]):
+                    self.assertEqual(after[x][y], 0)
+                    self.assertEqual(sum(a != b for r1, r2 in zip(before, after)
+                                         for a, b in zip(r1, r2)), 2)
+
+    def test_constructive_optimal_on_3x3(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        self.assertEqual(constructive_solve(SearchTree(state, self.goal_3))[1], 25)
+
+    def test_constructive_unsolvable_returns_none(self):
+        goal = generate_goal_state(5)
+        state = [list(row) for row in goal]
+        state[0][0], state[0][1] = state[0][1], state[0][0]
+
+        self.assertIsNone(constructive_solve(SearchTree(state, goal)))
+
+    def test_shorten_removes_backtracks_and_loops(self):
+        tree = SearchTree(self.goal_3, self.goal_3)
+        up, down, left, right = range(4)
+
+        # Up/Down cancels; the 2x2 blank cycle (12 moves) returns to the start
+        self.assertIs(shorten(tree, [up, down]), tree.root)
+        self.assertIs(shorten(tree, [up, left, down, right] * 3), tree.root)
+
+        # A loop in the middle is cut, the moves around it are kept
+        node = shorten(tree, [left] + [up, left, down, right] * 3 + [up])
+        self.assertEqual(node.g, 2)
+        self.assertEqual(node.state, tree.root.apply(left, 7, tree.bits)
+                         .apply(up, 4, tree.bits).state)
+
+    # ======================================================
+    # CHECKPOINT TESTS
+    # ======================================================
+
+    def test_astar_resume_continues_exactly(self):
+        _, board, _ = random_walk_instances(4, 1, 40, seed=3)[0]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "search.ckpt")
+            for open_list in ("heap", "buckets"):
+                full_tree = SearchTree(board, self.goal_4)
+                full = full_tree.A_star(open_list=open_list)
+
+                # Abort after the first 200 expansions, then continue from the file
+                tree = SearchTree(board, self.goal_4)
+                self.assertFalse(tree.A_star(open_list=open_list, progress=lambda stats: False,
+                                             progress_every=200, checkpoint=path))
+                tree = SearchTree(board, self.goal_4)
+                resumed = tree.A_star(open_list=open_list, resume=path)
+
+                self.assertEqual(resumed, full)
+                self.assertEqual(tree.stats.expansions, full_tree.stats.expansions)
+
+    def test_ida_star_resume_across_slices(self):
+        state = [
+            [8, 6, 7],
+            [2, 5, 4],
+            [3, 0, 1]
+        ]
+        full = SearchTree(state, self.goal_3, "manhattan").IDA_star()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "search.ckpt")
+            result = SearchTree(state, self.goal_3, "manhattan").IDA_star(
+                0.002, checkpoint=path)
+            slices = 1
+            while result is False:
+                result = resume_search(path, 0.002)
+                slices += 1
+
+        self.assertGreater(slices, 1)
+        self.assertEqual(result, full)
+
+    def test_checkpoint_rejects_other_search(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "search.ckpt")
+            _, board, _ = random_walk_instances(4, 1, 20, seed=1)[0]
+            SearchTree(board, self.goal_4).A_star(progress=lambda stats: False,
+                                                  progress_every=1, checkpoint=path)
+
+            with self.assertRaises(ValueError):
+                SearchTree(board, self.goal_4, "manhattan").A_star(resume=path)
+            with self.assertRaises(ValueError):
+                SearchTree(board, self.goal_4).IDA_star(resume=path)
+            with self.assertRaises(ValueError):
+                SearchTree(board, self.goal_4).A_star(open_list="buckets", resume=path)
+
+    # ======================================================
+    # BATCH SOLVER TESTS
+    # ======================================================
+
+    def test_read_puzzles_formats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            matrices = os.path.join(tmp, "puzzles.txt")
+            with open(matrices, "w") as file:
+                file.write("1 2 3\n4 5 6\n7 0 8\n\n1 2 3\n4 5 6\n0 7 8\n")
+            jsonl = os.path.join(tmp, "puzzles.jsonl")
+            with open(jsonl, "w") as file:
+                file.write(json.dumps({"id": "a", "board": self.solved_3}) + "\n")
+                file.write(json.dumps(self.solved_3) + "\n")
+
+            self.assertEqual(read_puzzles(matrices), [
+                (1, [[1, 2, 3], [4, 5, 6], [7, 0, 8]]),
+                (2, [[1, 2, 3], [4, 5, 6], [0, 7, 8]]),
+            ])
+            self.assertEqual(read_puzzles(jsonl), [("a", self.solved_3), (2, self.solved_3)])
+
+    def test_run_batch_statuses(self):
+        puzzles = [
+            ("one", [[1, 2, 3], [4, 5, 6], [7, 0, 8]]),
+            ("two", [[1, 2, 3], [4, 5, 6], [0, 7, 8]]),
+            ("bad", [[1, 2, 3], [4, 5, 5], [7, 8, 0]]),
+            ("odd", [[1, 2, 3], [4, 5, 6], [8, 7, 0]]),
+        ]
+        out = io.StringIO()
+        counts = run_batch(puzzles, out, algorithm="IDA_star", workers=2)
+        records = {r["id"]: r for r in map(json.loads, out.getvalue().splitlines())}
+
+        self.assertEqual(counts, {"solved": 2, "invalid": 1, "unsolvable": 1})
+        self.assertEqual(records["one"]["moves"], ["Right"])
+        self.assertEqual(records["two"]["cost"], 2)
+        self.assertEqual(records["bad"]["status"], "invalid")
+        self.assertEqual(records["odd"]["status"], "unsolvable")
+
+    def test_check_puzzle_rejects_bad_shapes(self):
+        for matrix in ([], [[]], [[0]], [[1, 0], [2, 3]], [[1, 2, 3], [4, 5, 6]]):
+            self.assertEqual(check_puzzle(matrix)[0], "invalid")
+
+    def test_run_batch_keeps_going_after_errors(self):
+        puzzles = [
+            ("one", [[1, 2, 3], [4, 5, 6], [7, 0, 8]]),
+            ("two", [[1, 2, 3], [4, 5, 6], [0, 7, 8]]),
+        ]
+        out = io.StringIO()
+        counts = run_batch(puzzles, out, heuristic="bogus", workers=1)
+        records = {r["id"]: r for r in map(json.loads, out.getvalue().splitlines())}
+
+        self.assertEqual(counts, {"error": 2})
+        self.assertIn("bogus", records["one"]["error"])
+
+    def test_solve_puzzle_resumes_checkpoint(self):
+        state = [
+            [8, 6, 7],
+            [2, 5, 4],
+            [3, 0, 1]
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            record = solve_puzzle("hard", state, "manhattan", "IDA_star", 0.002,
+                                  checkpoint_dir=tmp)
+            self.assertEqual(record["status"], "timeout")
+            self.assertTrue(os.path.exists(os.path.join(tmp, "hard.ckpt")))
+
+            while record["status"] == "timeout":
+                record = solve_puzzle("hard", state, "manhattan", "IDA_star", 0.002,
+                                      checkpoint_dir=tmp)
+            self.assertEqual(record["cost"], 31)
+            self.assertTrue(record["resumed"])
+            self.assertEqual(os.listdir(tmp), [])
+
+    # ======================================================
+    # SOLVER SERVICE TESTS
+    # ======================================================
+
+    # Start a service on a temporary Unix socket, send requests on one connection
+    # and return the responses (by id) together with the final metrics; setup(service)
+    # runs before the requests are sent
+    def _ask_service(self, requests, workers=1, setup=None):
+        async def scenario(path):
+            service = SolverService(workers)
+            server = await service.start(path)
+            if setup is not None:
+                setup(service)
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                for request in requests:
+                    writer.write((json.dumps(request) + "\n").encode())
+                await writer.drain()
+                responses = {}
+                for _ in requests:
+                    response = json.loads(await reader.readline())
+                    responses[response["id"]] = response
+                writer.close()
+                await writer.wait_closed()
+                while service.connections:   # let the server see the disconnect
+                    await asyncio.sleep(0.01)
+                return responses, service.metrics()
+            finally:
+                server.close()
+                service.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            return asyncio.run(scenario(os.path.join(tmp, "solver.sock")))
+
+    def test_service_solves_and_reports(self):
+        responses, metrics = self._ask_service([
+            {"id": "one", "board": [[1, 2, 3], [4, 5, 6], [7, 0, 8]]},
+            {"id": "odd", "board": [[1, 2, 3], [4, 5, 6], [8, 7, 0]]},
+            {"id": "bad", "board": [[1, 2, 3], [4, 5, 5], [7, 8, 0]], "algorithm": "IDA_star"},
+        ])
+
+        self.assertEqual(responses["one"]["moves"], ["Right"])
+        self.assertEqual(responses["odd"]["status"], "unsolvable")
+        self.assertEqual(responses["bad"]["status"], "invalid")
+        self.assertEqual(metrics["requests"], 3)
+        self.assertEqual(metrics["solves"], 1)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertIsNotNone(metrics["latency_ms"]["p99"])
+
+    def test_service_rejects_unservable_requests(self):
+        board = [[1, 2, 3], [4, 5, 6], [7, 0, 8]]
+        responses, metrics = self._ask_service([
+            {"id": "empty", "board": []},
+            {"id": "small", "board": [[1, 0], [2, 3]]},
+            {"id": "hda", "board": board, "algorithm": "HDA_star"},
+            {"id": "split", "board": board, "algorithm": "parallel_IDA_star"},
+            {"id": "text", "board": board, "deadline": "5"},
+            {"id": "negative", "board": board, "deadline": -1},
+        ])
+
+        self.assertEqual({r["status"] for r in responses.values()}, {"invalid"})
+        self.assertEqual(metrics["solves"], 0)
+
+    def test_service_replaces_dead_worker(self):
+        def kill_worker(service):
+            service.workers[0].process.terminate()
+            service.workers[0].process.join()
+
+        responses, metrics = self._ask_service([
+            {"id": "lost", "board": [[1, 2, 3], [4, 5, 6], [7, 0, 8]]},
+            {"id": "next", "board": [[1, 2, 3], [4, 5, 6], [0, 7, 8]]},
+        ], setup=kill_worker)
+
+        self.assertEqual(responses["lost"]["status"], "error")
+        self.assertEqual(responses["next"]["status"], "solved")
+        self.assertEqual(metrics["workers"], 1)
+
+    def test_service_deduplicates_in_flight_boards(self):
+        board = [[4, 1, 3], [7, 2, 6], [0, 5, 8]]
+        responses, metrics = self._ask_service(
+            [{"id": i, "board": board, "heuristic": "misplaced_tiles"} for i in range(3)])
+
+        self.assertEqual(metrics["solves"], 1)
+        self.assertEqual(metrics["deduplicated"], 2)
+        self.assertEqual({r["cost"] for r in responses.values()}, {6})
+
+    def test_service_deadline_kills_search(self):
+        hard = korf_instances()[0][1]
+        responses, metrics = self._ask_service([
+            {"id": "hard", "board": hard, "heuristic": "misplaced_tiles", "deadline": 0.3},
+            {"id": "easy", "board": [[1, 2, 3], [4, 5, 6], [7, 0, 8]]},
+        ])
+
+        self.assertEqual(responses["hard"]["status"], "timeout")
+        self.assertEqual(responses["easy"]["status"], "solved")
+        self.assertEqual(metrics["cancelled"], 1)
+        self.assertEqual(metrics["workers"], 1)
+
+    # ======================================================
+    # SOLUTION CACHE TESTS
+    # ======================================================
+
+    def test_cache_short_circuits_solved_states(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.db")
+            cache = SolutionCache(path)
+            expected = SearchTree(state, self.goal_3, cache=cache).A_star()
+            self.assertEqual(len(cache), 26)
+            cache.close()
+
+            # Every state on the stored path is solved from the cache alone
+            cache = SolutionCache(path)
+            self.assertEqual(SearchTree(state, self.goal_3, cache=cache).A_star(),
+                             (expected[0], 25, 1, True))
+            middle = [list(row) for row in expected[0][10][0]]
+            path_10, cost, processed_nodes, solved = SearchTree(middle, self.goal_3,
+                                                                cache=cache).A_star()
+            self.assertEqual((cost, processed_nodes), (15, 1))
+            self.assertEqual(path_10[1:], expected[0][11:])
+            self.assertEqual(cache.hit_rate, 1.0)
+            cache.close()
+
+    def test_cache_acts_as_exact_heuristic(self):
+        state = [
+            [1, 0, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        # One move off the cached path start
+        neighbor = [
+            [0, 1, 2],
+            [3, 5, 4],
+            [6, 8, 7]
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SolutionCache(os.path.join(directory, "cache.db"))
+            SearchTree(state, self.goal_3, cache=cache).A_star()
+
+            plain = SearchTree(neighbor, self.goal_3).A_star()
+            cached = SearchTree(neighbor, self.goal_3, cache=cache).A_star()
+            self.assertEqual(cached[1], plain[1])
+            self.assertLess(cached[2], plain[2])
+            self.assertGreater(cache.hits, 0)
+            cache.close()
+
+    def test_cache_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SolutionCache(os.path.join(directory, "cache.db"), max_entries=10)
+            tree = SearchTree(self.goal_3, self.goal_3, cache=cache)
+            cache.store(tree.goal_state, [(state, 1, 0) for state in range(1, 9)])
+            cache.lookup(tree.goal_state, 1)
+            cache.store(tree.goal_state, [(state, 1, 0) for state in range(100, 104)])
+
+            self.assertEqual(len(cache), 10)
+            self.assertIsNotNone(cache.lookup(tree.goal_state, 1))
+            self.assertIsNone(cache.lookup(tree.goal_state, 2))
+            self.assertIsNone(cache.lookup(tree.goal_state, 3))
+            self.assertIsNotNone(cache.lookup(tree.goal_state, 103))
+            cache.close()
+
+    # ======================================================
+    # BENCHMARK TESTS
+    # ======================================================
+
+    def test_benchmark_generators_are_seeded_and_solvable(self):
+        walks = random_walk_instances(4, 3, 30, seed=1)
+        randoms = random_instances(3, 5, seed=1)
+
+        self.assertEqual(walks, random_walk_instances(4, 3, 30, seed=1))
+        self.assertEqual(randoms, random_instances(3, 5, seed=1))
+        for name, board, optimal in walks:
+            self.assertTrue(is_solvable(board, self.goal_4))
+        for name, board, optimal in randoms:
+            self.assertTrue(is_solvable(board, self.goal_3))
+
+    def test_korf_instances_use_project_goal(self):
+        self.assertEqual(korf_board(list(range(16))), self.goal_4)
+        for name, board, optimal in korf_instances():
+            validate_matrix(board, 4)
+            self.assertTrue(is_solvable(board, self.goal_4))
+
+    def test_korf_optimal_costs_are_consistent(self):
+        instances = korf_instances()
+        self.assertEqual([name for name, _, _ in instances],
+                         [f"korf-{number}" for number in range(1, 101)])
+        for name, board, optimal in instances:
+            manhattan = SearchTree(board, self.goal_4, "manhattan")
+            combined = SearchTree(board, self.goal_4)
+            # Every move changes the Manhattan distance by one, so both share a parity
+            self.assertEqual((optimal - manhattan.heuristic(manhattan.root.state)) % 2, 0, name)
+            self.assertLessEqual(combined.heuristic(combined.root.state), optimal, name)
+
+    def test_benchmark_compare_flags_regressions(self):
+        results = run_suite(random_walk_instances(3, 1, 12, seed=2), ["manhattan"], ["A_star"])
+        record = results[0]
+
+        self.assertEqual(record["status"], "solved")
+        self.assertIn("peak_memory", record)
+        self.assertEqual(compare(results, results), [])
+
+        worse = [dict(record, nodes=record["nodes"] * 2)]
+        self.assertEqual(len(compare(worse, results)), 1)
+
     # ======================================================
     # INVERSION TESTS
     # ======================================================
@@ -239,6 +1383,19 @@ class TestNPuzzle(unittest.TestCase):
         inversions = count_relative_inversions(self.solved_3, self.goal_3)
         self.assertEqual(inversions, 0)
 
+    def test_inversion_count_matches_pairs(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            values = [rng.randrange(12) for _ in range(rng.randrange(30))]
+            pairs = sum(values[i] > values[j]
+                        for i in range(len(values)) for j in range(i + 1, len(values)))
+            self.assertEqual(SearchTree._count_inversions(values), pairs)
+
+    def test_inversion_count_negative_and_sparse_values(self):
+        self.assertEqual(SearchTree._count_inversions([-1, 5, -3, 10 ** 12, 0]), 4)
+        self.assertEqual(SearchTree._count_inversions([10 ** 15, -10 ** 15]), 1)
+        self.assertEqual(SearchTree._count_inversions([-2, -2, -5]), 2)
+
     def test_inversion_one(self):
         state = [
             [1, 2, 3],
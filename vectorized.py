@@ -0,0 +1,302 @@
+import time
+
+import numpy as np
+
+from Node import Node
+from open_list import OPEN_LISTS
+from search_stats import SearchStats
+
+BATCH = 64   # open nodes popped and expanded together
+
+# Blank displacement of each move code (Up, Down, Left, Right)
+STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class BatchScorer:
+
+    # Lookup tables for expanding and scoring many boards (rows of n*n tile bytes) at once
+    def __init__(self, tree):
+        n = tree.n
+        cells = n * n
+        self.n = n
+        self.heuristic_name = tree.heuristic_name
+        if self.heuristic_name not in ("manhattan_linear_conflict", "manhattan",
+                                       "misplaced_tiles"):
+            raise ValueError(f"Batched search does not support {self.heuristic_name}")
+
+        # targets[cell, move]: cell whose tile slides into the blank, or -1
+        self.targets = np.full((cells, 4), -1, dtype=np.int64)
+        for cell in range(cells):
+            x, y = divmod(cell, n)
+            for move, (dx, dy) in enumerate(STEPS):
+                if 0 <= x + dx < n and 0 <= y + dy < n:
+                    self.targets[cell, move] = (x + dx) * n + y + dy
+
+        # goal_line[axis, tile]: goal row (axis 0) or column (axis 1); -1 for the blank
+        goal_line = np.full((2, cells), -1, dtype=np.int64)
+        for tile in range(1, cells):
+            goal_line[:, tile] = tree.goal_pos[tile]
+        self.goal = np.array(tree.tiles(tree.goal_state), dtype=np.uint8)
+
+        # distance[cell, tile]: Manhattan distance of tile placed on cell
+        rows, cols = np.divmod(np.arange(cells), n)
+        self.distance = (np.abs(rows[:, None] - goal_line[0][None, :])
+                         + np.abs(cols[:, None] - goal_line[1][None, :]))
+        self.distance[:, 0] = 0
+        self.cell_index = np.arange(cells)
+
+        # Every ordered cell pair (first, second) sharing a row or a column
+        first, second, axis, line = [], [], [], []
+        for a in (0, 1):
+            for k in range(n):
+                members = [k * n + i if a == 0 else i * n + k for i in range(n)]
+                for i in range(n):
+                    for j in range(i + 1, n):
+                        first.append(members[i])
+                        second.append(members[j])
+                        axis.append(a)
+                        line.append(k)
+        self.first = np.array(first)
+        self.second = np.array(second)
+        self.axis = np.array(axis)
+        self.line = np.array(line)
+        self.goal_line = goal_line
+
+    # All children of a batch: (boards, zeros, moves, parent rows), skipping each
+    # node's move back to its parent (previous blank cell in back, -1 for none)
+    def expand(self, boards, zeros, back):
+        rows = np.arange(len(boards))
+        targets = self.targets[zeros]                        # (B, 4)
+        legal = (targets >= 0) & (targets != back[:, None])
+        parent_rows, moves = np.nonzero(legal)
+        cells = targets[parent_rows, moves]
+        old = zeros[parent_rows]
+
+        children = boards[parent_rows]
+        index = np.arange(len(children))
+        children[index, old] = children[index, cells]
+        children[index, cells] = 0
+        return children, cells, moves, rows[parent_rows]
+
+    # Heuristic of every board in a batch
+    def score(self, boards):
+        if self.heuristic_name == "misplaced_tiles":
+            return np.count_nonzero((boards != self.goal) & (boards != 0), axis=1)
+
+        h = self.distance[self.cell_index, boards].sum(axis=1)
+        if self.heuristic_name == "manhattan":
+            return h
+
+        # A pair conflicts when both tiles belong to the line and are in reverse order
+        a = boards[:, self.first]
+        b = boards[:, self.second]
+        other = 1 - self.axis
+        conflicts = ((self.goal_line[self.axis, a] == self.line)
+                     & (self.goal_line[self.axis, b] == self.line)
+                     & (self.goal_line[other, a] > self.goal_line[other, b]))
+        return h + 2 * np.count_nonzero(conflicts, axis=1)
+
+
+# Pairwise comparisons per screening chunk (bounds the temporary arrays)
+SCREEN_PAIRS = 1 << 22
+
+
+# Bulk intake check of many boards: an (m, n*n) (or (m, n, n)) integer array in,
+# (valid, solvable) boolean masks out. valid follows validate_matrix (every number
+# 0..n*n-1 exactly once); solvable follows is_solvable for the goal (default row-major
+# with the blank last) and is False for invalid rows. A board is solvable when the
+# parity of its permutation onto the goal equals the parity of the blank's distance to
+# its goal cell; the permutation parity comes from pairwise comparisons of goal cells.
+def screen_boards(boards, goal_state=None):
+    boards = np.asarray(boards)
+    if boards.ndim == 3:
+        boards = boards.reshape(len(boards), -1)
+    if boards.ndim != 2:
+        raise ValueError("Boards must be an (m, n*n) or (m, n, n) array")
+    m, cells = boards.shape
+    n = int(round(cells ** 0.5))
+    if n * n != cells:
+        raise ValueError("Invalid number of elements in matrix")
+
+    if goal_state is None:
+        goal = np.roll(np.arange(cells), -1)
+    else:
+        goal = np.asarray(goal_state).ravel()
+        if sorted(goal.tolist()) != list(range(cells)):
+            raise ValueError("Goal state must contain all numbers from 0 to n*n-1")
+
+    valid = (np.sort(boards, axis=1) == np.arange(cells)).all(axis=1)
+    solvable = np.zeros(m, dtype=bool)
+    if not valid.any():
+        return valid, solvable
+
+    goal_cell = np.empty(cells, dtype=np.uint8 if cells <= 256 else np.int64)
+    goal_cell[goal] = np.arange(cells)
+    first, second = np.triu_indices(cells, 1)
+    home = goal_cell[0]
+    chunk = max(1, SCREEN_PAIRS // len(first))
+
+    rows = np.flatnonzero(valid)
+    for start in range(0, len(rows), chunk):
+        index = rows[start:start + chunk]
+        targets = goal_cell[boards[index]]          # goal cell of the tile on each cell
+        inversions = np.count_nonzero(targets[:, first] > targets[:, second], axis=1)
+        zero = np.argmax(boards[index] == 0, axis=1)
+        distance = np.abs(zero // n - home // n) + np.abs(zero % n - home % n)
+        solvable[index] = (inversions - distance) % 2 == 0
+    return valid, solvable
+
+
+class BoardStore:
+
+    # Search nodes as numpy arrays indexed by an integer handle
+    def __init__(self, cells, capacity=1024):
+        self.size = 0
+        self.boards = np.empty((capacity, cells), dtype=np.uint8)
+        self.zero = np.empty(capacity, dtype=np.int64)
+        self.g = np.empty(capacity, dtype=np.int64)
+        self.parent = np.empty(capacity, dtype=np.int64)
+        self.move = np.empty(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return self.size
+
+    # Append a batch of nodes; returns the handle of the first one
+    def add(self, boards, zeros, g, parents, moves):
+        start, end = self.size, self.size + len(boards)
+        if end > len(self.g):
+            capacity = max(end, 2 * len(self.g))
+            self.boards = np.resize(self.boards, (capacity, self.boards.shape[1]))
+            for name in ("zero", "g", "parent", "move"):
+                setattr(self, name, np.resize(getattr(self, name), capacity))
+
+        self.boards[start:end] = boards
+        self.zero[start:end] = zeros
+        self.g[start:end] = g
+        self.parent[start:end] = parents
+        self.move[start:end] = moves
+        self.size = end
+        return start
+
+    # Rebuild the Node chain ending at handle, for SearchTree.solution
+    def chain(self, tree, handle):
+        handles = []
+        while handle >= 0:
+            handles.append(handle)
+            handle = int(self.parent[handle])
+
+        node = None
+        for handle in reversed(handles):
+            move = int(self.move[handle])
+            node = Node(tree.pack(self.boards[handle].tolist()), int(self.g[handle]), node,
+                        move if move >= 0 else None, int(self.zero[handle]))
+        return node
+
+
+# A* that pops up to batch open nodes at a time and expands and scores all their
+# children with NumPy. Nodes are goal-tested when popped, so the cost stays optimal;
+# a batch may expand a few nodes plain A* would not. Returns the A_star result tuple.
+def batched_a_star(tree, time_limit=None, batch=BATCH, open_list="heap"):
+    start_time = time.time()
+    processed_nodes = 1
+    clock = time.perf_counter
+
+    if open_list not in OPEN_LISTS:
+        raise ValueError(f"Unknown open list: {open_list}")
+
+    stats = tree.stats = SearchStats()
+
+    if tree.goal_test(tree.root.state):
+        stats.finish("solved")
+        return tree.solution(tree.root), 0, processed_nodes, True
+
+    scorer = BatchScorer(tree)
+    cells = tree.n * tree.n
+    key_type = np.dtype((np.void, cells))   # one board row as a hashable bytes key
+
+    frontier = OPEN_LISTS[open_list]()
+    store = BoardStore(cells)
+    best_g = {}                              # board bytes -> (g, handle)
+
+    root = np.array([tree.tiles(tree.root.state)], dtype=np.uint8)
+    handle = store.add(root, [tree.root.zero], [0], [-1], [-1])
+    best_g[root.tobytes()] = (0, handle)
+    frontier.push(int(scorer.score(root)[0]), 0, handle)
+    goal = scorer.goal.tobytes()
+
+    while frontier:
+
+        # Stop if time limit exceeded
+        if time_limit is not None and (time.time() - start_time) >= time_limit:
+            print("\nTime limit exceeded")
+            stats.finish("timeout")
+            return False
+
+        if len(frontier) > stats.peak_open:
+            stats.peak_open = len(frontier)
+
+        # Pop the next slice of the open list, skipping outdated entries
+        tick = clock()
+        handles = []
+        while frontier and len(handles) < batch:
+            handle = frontier.pop()
+            key = store.boards[handle].tobytes()
+            if best_g[key][1] != handle:
+                stats.stale += 1
+                continue
+            if key == goal:
+                stats.finish("solved")
+                node = store.chain(tree, handle)
+                return tree.solution(node), node.g, processed_nodes, True
+            handles.append(handle)
+        stats.queue_time += clock() - tick
+        if not handles:
+            continue
+
+        # Expand the whole slice
+        tick = clock()
+        handles = np.array(handles)
+        parents = store.parent[handles]
+        back = np.where(parents >= 0, store.zero[np.maximum(parents, 0)], -1)
+        children, zeros, moves, rows = scorer.expand(store.boards[handles],
+                                                     store.zero[handles], back)
+        g = store.g[handles][rows] + 1
+        stats.expand_time += clock() - tick
+        stats.expansions += len(handles)
+        stats.generated += len(children)
+
+        tick = clock()
+        f = g + scorer.score(children)
+        stats.heuristic_time += clock() - tick
+
+        # Keep children that improve best_g (also against earlier children of the slice)
+        keep = []
+        first = len(store)
+        for i, key, child_g in zip(range(len(children)), children.view(key_type).ravel().tolist(),
+                                   g.tolist()):
+            best = best_g.get(key)
+            if best is None or child_g < best[0]:
+                best_g[key] = (child_g, first + len(keep))
+                keep.append(i)
+            else:
+                stats.duplicates += 1
+
+        if keep:
+            handle = store.add(children[keep], zeros[keep], g[keep], handles[rows[keep]],
+                               moves[keep])
+            processed_nodes += len(keep)
+            tick = clock()
+            frontier.push_many(f[keep].tolist(), g[keep].tolist(),
+                               range(handle, handle + len(keep)))
+            stats.queue_time += clock() - tick
+
+        # Fail cleanly once the node budget is used up
+        if tree.max_nodes is not None and len(store) > tree.max_nodes:
+            print("\nMemory limit exceeded")
+            stats.finish("memory_limit")
+            return False
+
+        if len(best_g) > stats.peak_best_g:
+            stats.peak_best_g = len(best_g)
+
+    stats.finish("exhausted")